@@ -1,6 +1,20 @@
+import argparse
+import collections
+import concurrent.futures
+import multiprocessing
+import os
 import random
+import struct
+import time
 import pygame
 
+from fractions import Fraction
+
+import CrapsMetrics
+from CrapsRules import WIN, LOSE, POINTS, BetOdds, get_odds_table, get_settlement_table
+from CrapsSimulation import CancelToken, lower_worker_priority, run_sessions
+from CrapsState import TableState, load_checkpoint, save_checkpoint
+
 UI_COMPONENT_MOUSEMOTION =            pygame.USEREVENT + 1
 UI_COMPONENT_MOUSEBUTTONDOWN =        pygame.USEREVENT + 2
 TABLE_MOUSEMOTION =                   pygame.USEREVENT + 3
@@ -27,15 +41,68 @@ BET_MANAGER_OVERALL_WIN =             pygame.USEREVENT + 23
 BET_MANAGER_OVERALL_LOSE =            pygame.USEREVENT + 24
 BET_MANAGER_OVERALL_PUSH =            pygame.USEREVENT + 25
 
-WIN = "WIN"
-LOSE = "LOSE"
-
-def run():
-    craps = Craps("Craps", (1280, 1280//2))
-    craps.run()
+POOL_LIMIT = 256
+STEP_MS = 1000 / 60
+MAX_FRAME_MS = 250
+BUSY_POLL_MS = 100
+EVENT_BUDGET_MS = 8
+MAX_PENDING_EVENTS = 256
+CHECKPOINT_PATH = "craps.checkpoint"
+OUTCOME_LABELS = {WIN: "win", LOSE: "lose", "": "push"}
+
+fonts: "dict[int, pygame.font.Font]" = {}
+
+class TableMetrics:
+    def __init__(self, registry: CrapsMetrics.MetricsRegistry) -> None:
+        self.registry = registry
+        self.events = registry.counter("craps_events_handled_total", "Events dispatched through the UI component tree")
+        self.coalesced_events = registry.counter("craps_events_coalesced_total", "Mouse motion events dropped by coalescing")
+        self.budget_exceeded = registry.counter("craps_event_budget_exceeded_total", "Frames that deferred events past the event budget")
+        self.overflow_events = registry.counter("craps_events_overflow_total", "Input events handled past the event budget to keep the deferred queue bounded")
+        self.event_queue = registry.gauge("craps_event_queue_depth", "Events deferred to the next frame")
+        self.frame = registry.histogram("craps_frame_seconds", "Time spent handling events, updating and drawing a frame", CrapsMetrics.FRAME_BUCKETS)
+        self.component_limit = registry.counter("craps_component_limit_exceeded_total", "Times the live component count crossed the registry limit")
+        self.table_clicks = registry.counter("craps_table_clicks_total", "Clicks on the table layout by region", "bet")
+        self.bets_placed = registry.counter("craps_bets_placed_total", "Bets placed by type", "bet")
+        self.bets_wagered = registry.counter("craps_bets_wagered_dollars_total", "Dollars placed by bet type", "bet")
+        self.bet_outcomes = registry.counter("craps_bet_outcomes_total", "Bet settlements by outcome", "outcome")
+        self.rolls = registry.counter("craps_rolls_total", "Dice rolls settled; use rate() for rolls over an arbitrary window")
+        self.rolls_per_minute = registry.rate("craps_rolls_per_minute", "Dice rolls settled in the last minute")
+        self.settlement = registry.histogram("craps_settlement_seconds", "Time to settle one bet against a roll", CrapsMetrics.LATENCY_BUCKETS)
+        self.bankroll_delta = registry.histogram("craps_roll_bankroll_delta_dollars", "Net bankroll change per roll", (-100, -50, -25, -10, -5, -1, 0, 1, 5, 10, 25, 50, 100))
+
+metrics: TableMetrics = None
+
+def enable_metrics(craps: "Craps", port: int) -> "http.server.ThreadingHTTPServer":
+    global metrics
+
+    metrics = TableMetrics(CrapsMetrics.MetricsRegistry())
+    metrics.registry.gauge("craps_components", "Live UI components by type", "type", lambda: dict(craps.registry.counts))
+    metrics.registry.gauge("craps_components_animating", "Components with a running animation", function=lambda: len(craps.registry.animating))
+
+    return CrapsMetrics.start_server(port, metrics.registry)
+
+def run(rules: str = "standard", metrics_port: int = 0):
+    craps = Craps("Craps", (1280, 1280//2), rules)
+
+    server = None
+    if metrics_port:
+        server = enable_metrics(craps, metrics_port)
+
+    try:
+        craps.run()
+    finally:
+        if server is not None:
+            server.shutdown()
+
+def get_font(text_size: int) -> pygame.font.Font:
+    if text_size not in fonts:
+        fonts[text_size] = pygame.font.Font(None, text_size)
+
+    return fonts[text_size]
 
 class Craps:
-    def __init__(self, caption: str, size: "tuple[int, int]") -> None:
+    def __init__(self, caption: str, size: "tuple[int, int]", rules: str = "standard") -> None:
         pygame.init()
         pygame.display.set_caption(caption)
 
@@ -47,101 +114,408 @@ class Craps:
         self.ms = 0
         self.size = size
         self.screen_rect = pygame.rect.Rect((0, 0), size)
+        self.event_budget_ms = EVENT_BUDGET_MS
+        self.max_pending_events = MAX_PENDING_EVENTS
+        self.pending_events: "collections.deque[pygame.event.Event]" = collections.deque()
+        self.event_stats: "dict[str, float]" = {}
+        self.event_backlog = False
+        self.accumulator = 0.0
+        self.was_animating = False
 
         self.ui_component = UIComponent(None, self.screen_rect)
+        self.registry = self.ui_component.registry
         self.table_manager = TableManager(self.ui_component, self.screen_rect, "craps_table_correct.png", "craps_table_regions.png")
-        self.bet_manager = BetManager(self.ui_component, self.screen_rect)
+        self.bet_manager = BetManager(self.ui_component, self.screen_rect, rules)
         self.chip_tray_manager = ChipTrayManager(self.ui_component, self.screen_rect)
         self.puck_manager = PuckManager(self.ui_component, self.screen_rect)
         self.dice_manager = DiceManager(self.ui_component, self.screen_rect)
         self.money_manager = MoneyManager(self.ui_component, self.screen_rect)
+        self.odds_manager = OddsManager(self.ui_component, self.screen_rect, self.bet_manager)
+        self.what_if_manager = WhatIfManager(self.ui_component, self.screen_rect, self.bet_manager, self.puck_manager, self.money_manager)
+        self.history_manager = HistoryManager(self.ui_component, self.screen_rect, self.money_manager)
         self.tooltip_manager = ToolTipManager(self.ui_component, self.screen_rect)
 
     def run(self) -> None:
+        last_ticks = pygame.time.get_ticks()
+
         while self.running:
-            dt = self.clock.tick(self.fps)
-            self.ms += dt
-            self.surface.fill((255, 255, 255))
+            if not self.is_active():
+                self.wait_for_event()
+
+            ticks = pygame.time.get_ticks()
+            self.step(ticks - last_ticks)
+            last_ticks = ticks
+
+            pygame.display.flip()
+
+            if self.is_active():
+                self.clock.tick(self.fps)
+
+        self.what_if_manager.shutdown()
+
+    def is_active(self) -> bool:
+        return bool(self.registry.animating or self.pending_events)
+
+    def wait_for_event(self) -> None:
+        timeout = 0
+        if self.what_if_manager.is_busy():
+            timeout = BUSY_POLL_MS
+
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.pending_events.append(event)
+
+    def step(self, dt: float) -> None:
+        start = time.perf_counter()
+        self.ms += dt
+        self.surface.fill((255, 255, 255))
+
+        self.event_loop()
+
+        if self.registry.animating:
+            if not self.was_animating:
+                dt = min(dt, STEP_MS)
 
-            self.event_loop()
+            self.accumulator = min(self.accumulator + dt, MAX_FRAME_MS)
+            while self.accumulator >= STEP_MS:
+                self.ui_component.update(STEP_MS)
+                self.accumulator -= STEP_MS
 
+            self.registry.alpha = self.accumulator / STEP_MS
+        else:
             self.ui_component.update(dt)
-            self.ui_component.draw(self.surface, self.screen_rect)
+            self.accumulator = 0.0
+            self.registry.alpha = 1.0
 
-            pygame.display.flip()
+        self.was_animating = bool(self.registry.animating)
+        self.registry.compact()
+        self.ui_component.draw(self.surface, self.screen_rect)
 
-            component_count = self.ui_component.get_component_count()
-            if component_count > 1000:
-                print("WARNING: Component Count Exceeds 1000: %d" % component_count)
+        if metrics is not None:
+            metrics.frame.observe(time.perf_counter() - start)
 
     def event_loop(self) -> None:
-        event_loop_running = True
-        while event_loop_running:
-            event_loop_running = False
+        start = time.perf_counter()
+
+        events = self.pending_events
+        self.pending_events = collections.deque()
+
+        raw_events = pygame.event.get()
+        coalesced_events = self.coalesce_events(raw_events)
+        events.extend(coalesced_events)
+
+        self.event_stats = {
+            "raw": len(raw_events),
+            "coalesced": len(raw_events) - len(coalesced_events),
+            "handled": 0,
+            "deferred": 0,
+            "overflow": 0,
+            "ms": 0.0
+        }
 
-            for event in pygame.event.get():
+        deadline = start + self.event_budget_ms / 1000
+        over_budget = False
+        while events:
+            if not over_budget and self.event_stats["handled"] and time.perf_counter() >= deadline:
+                over_budget = True
+                pending = self.coalesce_events(list(events))
+                self.event_stats["coalesced"] += len(events) - len(pending)
+                events = collections.deque(pending)
+
+            if over_budget and len(events) <= self.max_pending_events:
+                self.pending_events = events
+                self.event_stats["deferred"] = len(events)
+                break
+
+            if over_budget:
+                self.event_stats["overflow"] += 1
+
+            cascade = collections.deque((events.popleft(),))
+            while cascade:
+                event = cascade.popleft()
                 if event.type == pygame.QUIT:
                     self.running = False
-                
+
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                    save_checkpoint(CHECKPOINT_PATH, self.get_state(), self.dice_manager.rng, self.dice_manager.rolls)
+                    print("Saved Checkpoint %s" % CHECKPOINT_PATH)
+
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and os.path.exists(CHECKPOINT_PATH):
+                    self.load_table_checkpoint(CHECKPOINT_PATH)
+
                 events_to_post: "list[pygame.event.Event]" = []
                 self.ui_component.handle_event(event, events_to_post)
+                cascade.extend(events_to_post)
+
+                self.event_stats["handled"] += 1
+
+        self.event_stats["ms"] = (time.perf_counter() - start) * 1000
+
+        if over_budget and not self.event_backlog:
+            print("WARNING: Event Budget Exceeded, Deferring %d Events" % len(self.pending_events))
+        self.event_backlog = bool(self.pending_events)
+
+        if metrics is not None:
+            if over_budget:
+                metrics.budget_exceeded.inc()
+                metrics.overflow_events.inc(self.event_stats["overflow"])
+            metrics.events.inc(self.event_stats["handled"])
+            metrics.coalesced_events.inc(self.event_stats["coalesced"])
+            metrics.event_queue.set(len(self.pending_events))
+
+    def get_state(self) -> TableState:
+        return TableState(self.puck_manager.current_point, int(round(self.money_manager.money)), self.bet_manager.bets, self.bet_manager.rules)
+
+    def restore_state(self, state: TableState) -> None:
+        if state.rules != self.bet_manager.rules:
+            raise RuntimeError("State rules %s do not match table rules %s" % (state.rules, self.bet_manager.rules))
+
+        for bet, amount in state.bets:
+            if bet not in self.bet_manager.coordinate_mapping:
+                raise RuntimeError("Bet %s has no position on the table" % bet)
+
+        self.puck_manager.set_point(state.point)
+        self.bet_manager.set_bets(state.get_bets(), state.point)
+        self.odds_manager.current_point = state.point
+        self.money_manager.set_money(state.money, sum(amount for bet, amount in state.bets) * 100)
+
+        if self.what_if_manager.visible:
+            self.what_if_manager.schedule_restart()
+
+    def load_table_checkpoint(self, path: str) -> bool:
+        try:
+            state, rng, rolls = load_checkpoint(path)
+            self.restore_state(state)
+        except (OSError, RuntimeError, ValueError, struct.error) as error:
+            print("WARNING: Failed To Load Checkpoint %s: %s" % (path, error))
+            return False
+
+        if rng is not None:
+            self.dice_manager.rng.setstate(rng.getstate())
+            self.dice_manager.rolls = rolls
+
+        print("Loaded Checkpoint %s" % path)
+        return True
+
+    def coalesce_events(self, events: "list[pygame.event.Event]") -> "list[pygame.event.Event]":
+        last_motion = -1
+        for index, event in enumerate(events):
+            if event.type == pygame.MOUSEMOTION:
+                last_motion = index
+
+        return [event for index, event in enumerate(events) if event.type != pygame.MOUSEMOTION or index == last_motion]
+
+class ComponentRegistry:
+    def __init__(self, limit: int = 1000) -> None:
+        self.limit = limit
+        self.counts: "dict[str, int]" = {}
+        self.peaks: "dict[str, int]" = {}
+        self.total = 0
+        self.peak_total = 0
+        self.created = 0
+        self.destroyed = 0
+        self.over_limit = False
+        self.dirty: "dict[UIComponent, None]" = {}
+        self.animating: "dict[UIComponent, None]" = {}
+        self.alpha = 1.0
+
+    def register(self, component: "UIComponent") -> None:
+        name = type(component).__name__
+        count = self.counts.get(name, 0) + 1
+        self.counts[name] = count
+        self.peaks[name] = max(self.peaks.get(name, 0), count)
+
+        self.total += 1
+        self.peak_total = max(self.peak_total, self.total)
+        self.created += 1
+
+        if self.total > self.limit and not self.over_limit:
+            self.over_limit = True
+            if metrics is not None:
+                metrics.component_limit.inc()
+            print("WARNING: Component Count Exceeds %d: %d" % (self.limit, self.total))
+
+    def unregister(self, component: "UIComponent") -> None:
+        name = type(component).__name__
+        self.counts[name] -= 1
+
+        self.total -= 1
+        self.destroyed += 1
+        self.animating.pop(component, None)
+
+        if self.total <= self.limit:
+            self.over_limit = False
+
+    def mark_dirty(self, component: "UIComponent") -> None:
+        self.dirty[component] = None
+
+    def start_animation(self, component: "UIComponent") -> None:
+        self.animating[component] = None
+
+    def stop_animation(self, component: "UIComponent") -> None:
+        self.animating.pop(component, None)
+
+    def compact(self) -> None:
+        if not self.dirty:
+            return
+
+        dirty = self.dirty
+        self.dirty = {}
+
+        for component in dirty:
+            if not component.alive:
+                continue
+
+            child_components: "list[UIComponent]" = []
+            for child in component.child_components:
+                if child.alive:
+                    child_components.append(child)
+                else:
+                    child.release()
+
+            component.child_components = child_components
+
+    def get_metrics(self) -> "dict[str, int]":
+        metrics = {
+            "components_total": self.total,
+            "components_peak": self.peak_total,
+            "components_created": self.created,
+            "components_destroyed": self.destroyed,
+            "components_pending_compaction": len(self.dirty),
+            "components_animating": len(self.animating)
+        }
+
+        for name, count in sorted(self.counts.items()):
+            metrics["components_%s" % name] = count
 
-                for event_to_post in events_to_post:
-                    pygame.event.post(event_to_post)
-                    event_loop_running = True
+        return metrics
+
+class Motion:
+    __slots__ = ("start", "end", "duration", "elapsed", "destroy_on_finish")
+
+    def __init__(self, start: "tuple[int, int]", end: "tuple[int, int]", duration: float, destroy_on_finish: bool = False) -> None:
+        self.start = start
+        self.end = end
+        self.duration = max(duration, 1)
+        self.elapsed = 0.0
+        self.destroy_on_finish = destroy_on_finish
+
+    def advance(self, dt: float) -> "tuple[int, int]":
+        self.elapsed = min(self.elapsed + dt, self.duration)
+        progress = 1 - (1 - self.elapsed / self.duration) ** 3
+
+        return (round(self.start[0] + (self.end[0] - self.start[0]) * progress), round(self.start[1] + (self.end[1] - self.start[1]) * progress))
+
+    def is_finished(self) -> bool:
+        return self.elapsed >= self.duration
 
 class UIComponent:
+    __slots__ = ("ms", "rect", "parent", "child_components", "alive", "visible", "draw_bounds", "registry", "motion", "previous_pos")
+
+    pool: "list[UIComponent]" = None
+
     def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect) -> None:
+        self.attach(parent, rect)
+
+    @classmethod
+    def create(cls, parent: "UIComponent", *args) -> "UIComponent":
+        if cls.pool:
+            component = cls.pool.pop()
+            component.attach(parent, None)
+            component.setup(*args)
+            return component
+
+        return cls(parent, *args)
+
+    def attach(self, parent: "UIComponent", rect: pygame.rect.Rect) -> None:
         self.ms = 0
         self.rect = rect
         self.parent: UIComponent = parent
         self.child_components: "list[UIComponent]" = []
         self.alive = True
+        self.visible = True
         self.draw_bounds = False
+        self.motion: Motion = None
+        self.previous_pos: "tuple[int, int]" = None
 
         if parent:
+            self.registry = parent.registry
             parent.child_components.append(self)
+        else:
+            self.registry = ComponentRegistry()
 
-    def get_component_count(self) -> int:
-        count = 1
+        self.registry.register(self)
 
+    def release(self) -> None:
         for child in self.child_components:
-            count += child.get_component_count()
+            child.release()
+
+        self.parent = None
+        self.child_components = []
 
-        return count
+        if self.pool is not None and len(self.pool) < POOL_LIMIT:
+            self.pool.append(self)
 
     def destroy(self) -> None:
+        if not self.alive:
+            return
+
         self.alive = False
+        self.registry.unregister(self)
+
+        if self.parent is not None and self.parent.alive:
+            self.registry.mark_dirty(self.parent)
 
         for child in self.child_components:
             child.destroy()
 
-    def update(self, dt: int) -> None:
+    def move_to(self, pos: "tuple[int, int]", duration: float, destroy_on_finish: bool = False) -> None:
+        self.motion = Motion(self.rect.topleft, pos, duration, destroy_on_finish)
+        self.previous_pos = self.rect.topleft
+        self.registry.start_animation(self)
+
+    def update(self, dt: float) -> None:
         self.ms += dt
 
-        all_alive = True
+        if self.motion is not None:
+            self.previous_pos = self.rect.topleft
+            self.rect.topleft = self.motion.advance(dt)
+
+            if self.motion.is_finished():
+                if self.motion.destroy_on_finish:
+                    self.destroy()
+
+                self.motion = None
+                self.previous_pos = None
+                self.registry.stop_animation(self)
+
         for child in self.child_components:
             child.update(dt)
-            if not child.alive:
-                all_alive = False
 
-        if not all_alive:
-            self.child_components = [child for child in self.child_components if child.alive]
+    def get_draw_pos(self) -> "tuple[int, int]":
+        if self.previous_pos is None:
+            return self.rect.topleft
+
+        alpha = self.registry.alpha
+        return (round(self.previous_pos[0] + (self.rect.x - self.previous_pos[0]) * alpha), round(self.previous_pos[1] + (self.rect.y - self.previous_pos[1]) * alpha))
 
     def draw(self, surface: pygame.Surface, bounds: pygame.rect.Rect) -> None:
         if self.draw_bounds:
             pygame.draw.rect(surface, (0, 0, 0), bounds, 1)
 
         for child in self.child_components:
+            if not child.visible:
+                continue
+
             child_surface = pygame.Surface(child.rect.size, pygame.SRCALPHA)
             child_rect = child.rect.copy()
             child_rect.topleft = (0, 0)
             child.draw(child_surface, child_rect)
-            surface.blit(child_surface, child.rect)
+            surface.blit(child_surface, child.get_draw_pos())
 
     def handle_event(self, event: pygame.event.Event, events_to_post: "list[pygame.event.Event]") -> None:
         if event.type == pygame.MOUSEMOTION or event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos: "tuple[int, int]" = event.pos
             if self.rect.collidepoint(mouse_pos):
                 relative_mouse = (mouse_pos[0] - self.rect.x, mouse_pos[1] - self.rect.y)
                 
@@ -162,11 +536,18 @@ class UIComponent:
             child.handle_event(event, events_to_post)
 
 class Text(UIComponent):
+    __slots__ = ("text", "text_render")
+
+    pool: "list[Text]" = []
+
     def __init__(self, parent: "UIComponent", pos: "tuple[int, int]", text: str, color: "tuple[int, int, int]", text_size: int) -> None:
         super().__init__(parent, None)
 
+        self.setup(pos, text, color, text_size)
+
+    def setup(self, pos: "tuple[int, int]", text: str, color: "tuple[int, int, int]", text_size: int) -> None:
         self.text = text
-        font = pygame.font.Font(None, text_size)
+        font = get_font(text_size)
 
         self.text_render = font.render(text, True, color)
         self.rect = self.text_render.get_rect()
@@ -178,9 +559,16 @@ class Text(UIComponent):
         super().draw(surface, bounds)
 
 class MultiLineText(UIComponent):
+    __slots__ = ("text",)
+
+    pool: "list[MultiLineText]" = []
+
     def __init__(self, parent: "UIComponent", pos: "tuple[int, int]", text: "list[str]", text_size: int) -> None:
         super().__init__(parent, None)
 
+        self.setup(pos, text, text_size)
+
+    def setup(self, pos: "tuple[int, int]", text: "list[str]", text_size: int) -> None:
         self.text = text
         
         line_spacing = 5
@@ -191,7 +579,7 @@ class MultiLineText(UIComponent):
         height = 0
 
         for line in self.text:
-            child = Text(self, (left, top), line, (0, 0, 0), text_size)
+            child = Text.create(self, (left, top), line, (0, 0, 0), text_size)
 
             width = max(width, child.rect.width)
             height += child.rect.height + line_spacing
@@ -201,14 +589,21 @@ class MultiLineText(UIComponent):
         self.rect = pygame.rect.Rect(pos, (width, height))
 
 class ToolTip(UIComponent):
+    __slots__ = ("text", "multiline")
+
+    pool: "list[ToolTip]" = []
+
     def __init__(self, parent: "UIComponent", pos: "tuple[int, int]", text: "list[str]") -> None:
         super().__init__(parent, None)
 
+        self.setup(pos, text)
+
+    def setup(self, pos: "tuple[int, int]", text: "list[str]") -> None:
         self.text = text
 
         padding = 5
         text_size = 24
-        self.multiline = MultiLineText(self, (padding, padding), text, text_size)
+        self.multiline = MultiLineText.create(self, (padding, padding), text, text_size)
 
         self.rect = pygame.rect.Rect(pos, (self.multiline.rect.width + padding * 2, self.multiline.rect.height + padding * 2))
 
@@ -219,6 +614,8 @@ class ToolTip(UIComponent):
         super().draw(surface, bounds)
 
 class TableManager(UIComponent):
+    __slots__ = ("table_img", "regions_img", "regions_mapping")
+
     def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect, table_img_path: str, regions_img_path: str) -> None:
         super().__init__(parent, rect)
 
@@ -275,6 +672,8 @@ class TableManager(UIComponent):
                 event_type = TABLE_MOUSEMOTION
             else:
                 event_type = TABLE_MOUSEBUTTONDOWN
+                if metrics is not None:
+                    metrics.table_clicks.inc(1, bet)
                 print("Click", bet, pos, (pos[0] / self.rect.width, pos[1] / self.rect.height))
                 
             event_to_post = pygame.event.Event(event_type, {
@@ -301,17 +700,20 @@ class TableManager(UIComponent):
                 events_to_post.append(event_to_post)
 
 class ToolTipManager(UIComponent):
+    __slots__ = ("hover_tooltip", "clear_tooltip")
+
     def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect) -> None:
         super().__init__(parent, rect)
 
         self.hover_tooltip: ToolTip = None
         self.clear_tooltip = False
 
-    def update(self, dt: int) -> None:
+    def update(self, dt: float) -> None:
         super().update(dt)
 
         if self.clear_tooltip and self.hover_tooltip is not None:
             self.hover_tooltip.destroy()
+            self.hover_tooltip = None
             self.clear_tooltip = False
 
     def handle_event(self, event: pygame.event.Event, events_to_post: "list[pygame.event.Event]") -> None:
@@ -327,8 +729,23 @@ class ToolTipManager(UIComponent):
             bet: str = event.bet
             current_bet: int = event.current_bet
             amount_added: int = event.amount_added
+            odds: BetOdds = event.odds
+            layout_roll_ev: Fraction = event.layout_roll_ev
+
+            lines = [
+                bet,
+                "$%d" % current_bet,
+                "Win: %.2f%%" % (100 * odds.win_probability),
+                "Pays: %d:%d" % (odds.payout.numerator, odds.payout.denominator),
+                "Edge: %.2f%%" % (100 * odds.get_house_edge())
+            ]
+
+            if current_bet:
+                lines.append("EV: $%.2f" % (current_bet * odds.expected_value))
 
-            self.create_tooltip([bet, "$%d" % current_bet], screen_pos)
+            lines.append("Layout EV/Roll: $%.2f" % layout_roll_ev)
+
+            self.create_tooltip(lines, screen_pos)
 
         elif event.type == CHIP_TRAY_MANAGER_CHIP_HOVER or event.type == CHIP_TRAY_MANAGER_CHIP_SELECTED:
             pos: "tuple[int, int]" = event.pos
@@ -349,10 +766,13 @@ class ToolTipManager(UIComponent):
     def create_tooltip(self, lines: "list[str]", pos: "tuple[int, int]") -> None:
             self.clear_tooltip = False
 
-            if self.hover_tooltip is not None:
-                self.hover_tooltip.destroy()
+            if self.hover_tooltip is not None and self.hover_tooltip.alive and self.hover_tooltip.text == lines:
+                self.hover_tooltip.rect.topleft = pos
+            else:
+                if self.hover_tooltip is not None:
+                    self.hover_tooltip.destroy()
 
-            self.hover_tooltip = ToolTip(self, pos, lines)
+                self.hover_tooltip = ToolTip.create(self, pos, lines)
 
             if pos[0] / self.rect.width > 0.5:
                 self.hover_tooltip.rect.left -= self.hover_tooltip.rect.width + 10
@@ -365,9 +785,16 @@ class ToolTipManager(UIComponent):
                 self.hover_tooltip.rect.top += 10
 
 class Chip(UIComponent):
+    __slots__ = ("chip_color", "text_color", "border_color", "text")
+
+    pool: "list[Chip]" = []
+
     def __init__(self, parent: "UIComponent", pos: "tuple[int, int]", text: str, size: int) -> None:
         super().__init__(parent, None)
 
+        self.setup(pos, text, size)
+
+    def setup(self, pos: "tuple[int, int]", text: str, size: int) -> None:
         chip_size = size
         text_color_mapping: "dict[str, tuple[int, int, int]]" = {
             "1": (244, 224, 137),
@@ -398,7 +825,7 @@ class Chip(UIComponent):
         self.text_color = text_color_mapping[text]
         self.border_color = border_color_mapping[text]
         self.text = text
-        self.text = Text(self, (0, 0), text, self.text_color, int(0.65 * size))
+        self.text = Text.create(self, (0, 0), text, self.text_color, int(0.65 * size))
 
         self.rect = pygame.rect.Rect(0, 0, chip_size, chip_size)
         self.text.rect.center = self.rect.center
@@ -411,6 +838,8 @@ class Chip(UIComponent):
         super().draw(surface, bounds)
 
 class ChipStack(UIComponent):
+    __slots__ = ()
+
     def __init__(self, parent: "UIComponent", pos: "tuple[int, int]", amount: int, chip_size: int, offset: int) -> None:
         super().__init__(parent, None)
 
@@ -425,7 +854,7 @@ class ChipStack(UIComponent):
 
         for category, component in zip(chip_categories, chip_components):
             for index in range(component):
-                chip = Chip(self, (width // 2, current_offset), "%d" % category, chip_size)
+                chip = Chip.create(self, (width // 2, current_offset), "%d" % category, chip_size)
                 current_offset -= offset
 
     def get_number_components(self, number: int, categories: "list[int]") -> "list[int]":
@@ -439,11 +868,14 @@ class ChipStack(UIComponent):
         return components
 
 class BetManager(UIComponent):
-    def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect) -> None:
+    __slots__ = ("bets", "stacks", "selected_amount", "current_point", "coordinate_mapping", "layout_roll_ev", "rules", "settlement_table", "odds_table")
+
+    def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect, rules: str = "standard") -> None:
         super().__init__(parent, rect)
 
         self.bets: "dict[str, int]" = {}
         self.stacks: "dict[str, ChipStack]" = {}
+        self.set_rules(rules)
 
         self.selected_amount = 1
         self.current_point = 0
@@ -465,6 +897,9 @@ class BetManager(UIComponent):
             else:
                 self.add_bet(bet, self.selected_amount)
                 amount_added = self.selected_amount
+                if metrics is not None:
+                    metrics.bets_placed.inc(1, bet)
+                    metrics.bets_wagered.inc(amount_added, bet)
                 event_type = BET_MANAGER_BET_PLACED
                 
             current_bet = self.get_bet(bet)
@@ -474,7 +909,9 @@ class BetManager(UIComponent):
                 "color": color,
                 "bet": bet,
                 "current_bet": current_bet,
-                "amount_added": amount_added
+                "amount_added": amount_added,
+                "odds": self.get_odds(bet, self.current_point),
+                "layout_roll_ev": self.layout_roll_ev[self.current_point]
             })
 
             events_to_post.append(event_to_post)
@@ -530,168 +967,19 @@ class BetManager(UIComponent):
             "Any Craps": (0.7375, 0.9075)}
 
     def determine_bet_outcome(self, bet: str, dice_total: int, dice_values: "list[int]") -> "tuple[str, int, int]":
-        if bet == "Pass Line":
-            if self.current_point == 0:
-                if dice_total in (7, 11):
-                    return WIN, 1, 1
-                elif dice_total in (2, 3, 12):
-                    return LOSE, 0, 1
-            else:
-                if dice_total == self.current_point:
-                    return WIN, 1, 1
-                elif dice_total == 7:
-                    return LOSE, 0, 1
-
-        elif bet == "Don't Pass":
-            if self.current_point == 0:
-                if dice_total in (7, 11):
-                    return LOSE, 0, 1
-                elif dice_total in (2, 3):
-                    return WIN, 1, 1
-            else:
-                if dice_total == self.current_point:
-                    return LOSE, 0, 1
-                elif dice_total == 7:
-                    return WIN, 1, 1
-
-        elif bet == "Big 6":
-            if dice_total == 6:
-                return WIN, 1, 1
-            elif dice_total == 7:
-                return LOSE, 0, 1
-
-        elif bet == "Big 8":
-            if dice_total == 8:
-                return WIN, 1, 1
-            elif dice_total == 7:
-                return LOSE, 0, 1
-
-        elif bet == "Field":
-            if dice_total in (2, 12):
-                return WIN, 2, 1
-            elif dice_total in (3, 4, 9, 10, 11):
-                return WIN, 1, 1
-            else:
-                return LOSE, 0, 1
-
-        elif bet == "Come":
-            if dice_total in (7, 11):
-                return WIN, 1, 1
-            elif dice_total in (2, 3, 12):
-                return LOSE, 0, 1
-
-        elif bet == "Don't Come":
-            if dice_total in (7, 11):
-                return LOSE, 0, 1
-            elif dice_total in (2, 3):
-                return WIN, 1, 1
-
-        elif bet == "Place 4":
-            if dice_total == 4:
-                return WIN, 9, 5
-            elif dice_total == 7 and self.current_point != 0:
-                return LOSE, 0, 1
-
-        elif bet == "Place 5":
-            if dice_total == 5:
-                return WIN, 7, 5
-            elif dice_total == 7 and self.current_point != 0:
-                return LOSE, 0, 1
-
-        elif bet == "Place 6":
-            if dice_total == 6:
-                return WIN, 7, 6
-            elif dice_total == 7 and self.current_point != 0:
-                return LOSE, 0, 1
-
-        elif bet == "Place 8":
-            if dice_total == 8:
-                return WIN, 7, 6
-            elif dice_total == 7 and self.current_point != 0:
-                return LOSE, 0, 1
-
-        elif bet == "Place 9":
-            if dice_total == 9:
-                return WIN, 7, 5
-            elif dice_total == 7 and self.current_point != 0:
-                return LOSE, 0, 1
-
-        elif bet == "Place 10":
-            if dice_total == 10:
-                return WIN, 9, 5
-            elif dice_total == 7 and self.current_point != 0:
-                return LOSE, 0, 1
-
-        elif bet == "Any 7":
-            if dice_total == 7:
-                return WIN, 4, 1
-            else:
-                return LOSE, 0, 1
-
-        elif bet == "Hard 6":
-            if dice_values == [3, 3]:
-                return WIN, 9, 1
-            elif dice_total in (6, 7) and self.current_point != 0:
-                return LOSE, 0, 1
-
-        elif bet == "Hard 10":
-            if dice_values == [5, 5]:
-                return WIN, 7, 1
-            elif dice_total in (10, 7) and self.current_point != 0:
-                return LOSE, 0, 1
-
-        elif bet == "Hard 8":
-            if dice_values == [4, 4]:
-                return WIN, 9, 1
-            elif dice_total in (8, 7) and self.current_point != 0:
-                return LOSE, 0, 1
-
-        elif bet == "Hard 4":
-            if dice_values == [2, 2]:
-                return WIN, 7, 1
-            elif dice_total in (4, 7) and self.current_point != 0:
-                return LOSE, 0, 1
-
-        elif bet == "Three":
-            if dice_total == 3:
-                return WIN, 15, 1
-            else:
-                return LOSE, 0, 1
-
-        elif bet == "Two":
-            if dice_total == 2:
-                return WIN, 30, 1
-            else:
-                return LOSE, 0, 1
-
-        elif bet == "Twelve":
-            if dice_total == 12:
-                return WIN, 30, 1
-            else:
-                return LOSE
-
-        elif bet == "Eleven":
-            if dice_total == 11:
-                return WIN, 15, 1
-            else:
-                return LOSE, 0, 1
-
-        elif bet == "Any Craps":
-            if dice_total in (2, 3, 12):
-                return WIN, 7, 1
-            else:
-                return LOSE, 0, 1
-            
-        else:
-            raise RuntimeError("Invalid bet: %s" % bet)
-
-        return "", 0, 1
+        return self.settlement_table.settle(bet, self.current_point, dice_values)
 
     def dice_rolled(self, dice_total: int, dice_values: "list[int]", events_to_post: "list[pygame.event.Event]") -> None:
         total_win = 0
         current_bets = list(self.bets.items())
         for bet, amount in current_bets:
-            outcome, win, to = self.determine_bet_outcome(bet, dice_total, dice_values)
+            if metrics is None:
+                outcome, win, to = self.determine_bet_outcome(bet, dice_total, dice_values)
+            else:
+                start = time.perf_counter()
+                outcome, win, to = self.determine_bet_outcome(bet, dice_total, dice_values)
+                metrics.settlement.observe(time.perf_counter() - start)
+                metrics.bet_outcomes.inc(1, OUTCOME_LABELS[outcome])
 
             win_amount = int(amount * 100 * win / to) / 100
             print("Bet %s $%d wins %s" % (bet, amount, win_amount))
@@ -699,6 +987,7 @@ class BetManager(UIComponent):
             if outcome == WIN:
                 total_win += win_amount
                 event_type = BET_MANAGER_BET_WIN
+                self.create_payout_chip(bet, win_amount)
 
             elif outcome == LOSE:
                 self.clear_bet(bet)
@@ -718,6 +1007,11 @@ class BetManager(UIComponent):
 
             events_to_post.append(event_to_post)
 
+        if metrics is not None:
+            metrics.rolls.inc()
+            metrics.rolls_per_minute.mark()
+            metrics.bankroll_delta.observe(total_win)
+
         if total_win > 0:
             event_type = BET_MANAGER_OVERALL_WIN
 
@@ -735,6 +1029,18 @@ class BetManager(UIComponent):
 
         events_to_post.append(event_to_post)
 
+    def create_payout_chip(self, bet: str, amount: float) -> None:
+        chip_size = int(0.0234375 * self.rect.width)
+        label = "1"
+        for category in (100, 25, 5):
+            if amount >= category:
+                label = "%d" % category
+                break
+
+        chip = Chip.create(self, (self.rect.width // 2, chip_size), label, chip_size)
+        target = (int(self.coordinate_mapping[bet][0] * self.rect.width) - chip_size // 2, int(self.coordinate_mapping[bet][1] * self.rect.height) - chip_size // 2)
+        chip.move_to(target, 400, True)
+
     def get_bet(self, bet: str) -> int:
         if bet not in self.bets:
             return 0
@@ -754,16 +1060,48 @@ class BetManager(UIComponent):
         self.bets[bet] += amount
         self.stacks[bet] = ChipStack(self, stack_pos, self.bets[bet], chip_size, stack_offset)
 
+        self.update_layout_ev(bet, amount)
+
     def clear_bet(self, bet: str) -> None:
         if bet not in self.bets:
             return
 
         self.stacks[bet].destroy()
+        self.update_layout_ev(bet, -self.bets[bet])
 
         del self.bets[bet]
         del self.stacks[bet]
 
+    def set_bets(self, bets: "dict[str, int]", current_point: int) -> None:
+        for bet in list(self.bets):
+            self.clear_bet(bet)
+
+        self.current_point = current_point
+        for bet, amount in bets.items():
+            self.add_bet(bet, amount)
+
+    def set_rules(self, rules: str) -> None:
+        self.rules = rules
+        self.settlement_table = get_settlement_table(rules)
+        self.odds_table = get_odds_table(rules)
+
+        self.layout_roll_ev: "dict[int, Fraction]" = {point: Fraction(0) for point in (0,) + POINTS}
+        for bet, amount in self.bets.items():
+            self.update_layout_ev(bet, amount)
+
+    def get_odds(self, bet: str, current_point: int) -> BetOdds:
+        if (bet, current_point) not in self.odds_table:
+            raise RuntimeError("Invalid bet for %s rules: %s" % (self.rules, bet))
+
+        return self.odds_table[(bet, current_point)]
+
+    def update_layout_ev(self, bet: str, amount: int) -> None:
+        for point in self.layout_roll_ev:
+            self.layout_roll_ev[point] += amount * self.get_odds(bet, point).roll_expected_value
+
 class ChipTray(UIComponent):
+    __slots__ = ("chip_categories",)
+
     def __init__(self, parent: "UIComponent", pos: "tuple[int, int]", chip_size: int) -> None:
         super().__init__(parent, None)
 
@@ -777,7 +1115,7 @@ class ChipTray(UIComponent):
         for index, category in enumerate(self.chip_categories):
             chip_x = padding + chip_size // 2 + (chip_size + padding) * index
             chip_y = chip_size // 2 + padding
-            chip = Chip(self, (chip_x, chip_y), "%d" % category, chip_size)
+            chip = Chip.create(self, (chip_x, chip_y), "%d" % category, chip_size)
 
     def draw(self, surface: pygame.Surface, bounds: pygame.rect.Rect) -> None:
         pygame.draw.rect(surface, (255, 255, 255, 192), bounds, 0, 5)
@@ -808,6 +1146,8 @@ class ChipTray(UIComponent):
             events_to_post.append(event_to_post)
 
 class ChipTrayManager(UIComponent):
+    __slots__ = ("chip_tray", "selected_chip")
+
     def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect) -> None:
         super().__init__(parent, rect)
 
@@ -843,6 +1183,8 @@ class ChipTrayManager(UIComponent):
             events_to_post.append(event_to_post)
 
 class PuckManager(UIComponent):
+    __slots__ = ("current_point", "puck", "coordinate_mapping")
+
     def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect) -> None:
         super().__init__(parent, rect)
 
@@ -867,17 +1209,17 @@ class PuckManager(UIComponent):
             if dice_total in (4, 5, 6, 8, 9, 10):
                 if self.current_point == 0:
                     self.current_point = dice_total
-                    self.create_puck()
+                    self.create_puck(300)
                     event_type = PUCK_MANAGER_POINT_SET
 
                 elif self.current_point == dice_total:
                     self.current_point = 0
-                    self.create_puck()
+                    self.create_puck(300)
                     event_type = PUCK_MANAGER_POINT_WIN
 
             elif dice_total in (7,) and self.current_point != 0:
                 self.current_point = 0
-                self.create_puck()
+                self.create_puck(300)
                 event_type = PUCK_MANAGER_POINT_LOSE
 
             if event_type != 0:
@@ -890,17 +1232,28 @@ class PuckManager(UIComponent):
 
                 events_to_post.append(event_to_post)
 
-    def create_puck(self) -> None:
+    def set_point(self, current_point: int) -> None:
+        self.current_point = current_point
+        self.create_puck()
+
+    def create_puck(self, duration: float = 0) -> None:
         coords = (int(self.coordinate_mapping[self.current_point][0] * self.rect.width), int(self.coordinate_mapping[self.current_point][1] * self.rect.height))
         if self.current_point == 0:
             puck_text = "OFF"
         else:
             puck_text = "ON"
 
+        start_coords = coords
         if self.puck is not None:
+            start_coords = self.puck.rect.center
             self.puck.destroy()
 
-        self.puck = Chip(self, coords, puck_text, int(0.0625 * self.rect.width))
+        self.puck = Chip.create(self, start_coords, puck_text, int(0.0625 * self.rect.width))
+
+        if duration > 0 and start_coords != coords:
+            self.puck.move_to((coords[0] - self.puck.rect.width // 2, coords[1] - self.puck.rect.height // 2), duration)
+        else:
+            self.puck.rect.center = coords
 
     def define_puck_coordinates(self) -> None:
         self.coordinate_mapping: "dict[int, tuple[int, int]]" = {
@@ -913,9 +1266,16 @@ class PuckManager(UIComponent):
             10: (0.634375, 0.125)}
 
 class Dice(UIComponent):
+    __slots__ = ("number", "pip_size_single", "pip_size", "pip_rect")
+
+    pool: "list[Dice]" = []
+
     def __init__(self, parent: "UIComponent", pos: "tuple[int, int]", number: int, size: int) -> None:
         super().__init__(parent, None)
 
+        self.setup(pos, number, size)
+
+    def setup(self, pos: "tuple[int, int]", number: int, size: int) -> None:
         self.rect = pygame.rect.Rect(pos, (size, size))
         self.number = number
 
@@ -970,7 +1330,9 @@ class Dice(UIComponent):
         pygame.draw.circle(surface, (255, 255, 255), pos, size)
 
 class DiceSet(UIComponent):
-    def __init__(self, parent: "UIComponent", pos: "tuple[int, int]", count: int, dice_size: int) -> None:
+    __slots__ = ("number_of_dice", "dice_size", "padding", "dice", "values", "total", "tumble_ms")
+
+    def __init__(self, parent: "UIComponent", pos: "tuple[int, int]", count: int, dice_size: int, values: "list[int]" = None) -> None:
         super().__init__(parent, None)
 
         self.number_of_dice = 2
@@ -979,10 +1341,11 @@ class DiceSet(UIComponent):
         self.dice: "list[Dice]" = []
         self.values: "list[int]" = []
         self.total = 0
+        self.tumble_ms = 0.0
 
         self.rect = pygame.rect.Rect(pos, (count * (dice_size + self.padding) - self.padding, dice_size))
 
-        self.build_dice()
+        self.build_dice(values)
 
     def handle_event(self, event: pygame.event.Event, events_to_post: "list[pygame.event.Event]") -> None:
         super().handle_event(event, events_to_post)
@@ -1003,7 +1366,36 @@ class DiceSet(UIComponent):
 
             events_to_post.append(event_to_post)
 
-    def build_dice(self) -> None:
+    def update(self, dt: float) -> None:
+        super().update(dt)
+
+        if self.tumble_ms > 0:
+            face_changes = int(self.tumble_ms // 80)
+            self.tumble_ms -= dt
+
+            if self.tumble_ms <= 0:
+                for dice, value in zip(self.dice, self.values):
+                    dice.number = value
+
+                self.registry.stop_animation(self)
+
+            elif int(self.tumble_ms // 80) != face_changes:
+                for dice in self.dice:
+                    dice.number = random.randint(1, 6)
+
+    def tumble(self, duration: float) -> None:
+        distance = int(self.rect.width * 1.5)
+        pos = self.rect.topleft
+
+        self.rect.x += distance
+        self.move_to(pos, duration)
+
+        self.tumble_ms = duration
+        for dice in self.dice:
+            dice.number = random.randint(1, 6)
+        self.registry.start_animation(self)
+
+    def build_dice(self, values: "list[int]" = None) -> None:
         for dice in self.dice:
             dice.destroy()
         
@@ -1012,14 +1404,19 @@ class DiceSet(UIComponent):
         self.total = 0
         
         for index in range(self.number_of_dice):
-            dice_roll = random.randint(1, 6)
+            if values:
+                dice_roll = values[index]
+            else:
+                dice_roll = random.randint(1, 6)
             dice_x = (index * (self.dice_size + self.padding))
             dice_y = 0
-            self.dice.append(Dice(self, (dice_x, dice_y), dice_roll, self.dice_size))
+            self.dice.append(Dice.create(self, (dice_x, dice_y), dice_roll, self.dice_size))
             self.values.append(dice_roll)
             self.total += dice_roll
 
 class DiceManager(UIComponent):
+    __slots__ = ("dice_size", "pos_x", "pos_y", "number_of_dice", "dice_set", "rng", "rolls")
+
     def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect) -> None:
         super().__init__(parent, rect)
 
@@ -1029,6 +1426,8 @@ class DiceManager(UIComponent):
         self.pos_y = self.rect.bottom - self.dice_size - padding
         self.number_of_dice = 2
         self.dice_set: DiceSet = None
+        self.rng = random.Random()
+        self.rolls = 0
 
         self.create_dice()
 
@@ -1042,7 +1441,9 @@ class DiceManager(UIComponent):
             if event.type == DICE_SET_MOUSEMOTION:
                 event_type = DICE_MANAGER_DICE_HOVER
             else:
+                self.rolls += 1
                 self.create_dice()
+                self.dice_set.tumble(600)
                 event_type = DICE_MANAGER_DICE_ROLLED
                 
             dice_total = self.dice_set.total
@@ -1056,13 +1457,18 @@ class DiceManager(UIComponent):
 
             events_to_post.append(event_to_post)
 
-    def create_dice(self) -> None:
+    def create_dice(self, values: "list[int]" = None) -> None:
         if self.dice_set is not None:
             self.dice_set.destroy()
 
-        self.dice_set = DiceSet(self, (self.pos_x, self.pos_y), self.number_of_dice, self.dice_size)
+        if values is None:
+            values = [self.rng.randint(1, 6) for index in range(self.number_of_dice)]
+
+        self.dice_set = DiceSet(self, (self.pos_x, self.pos_y), self.number_of_dice, self.dice_size, values)
 
 class MoneyManager(UIComponent):
+    __slots__ = ("money", "betting", "last_win", "money_tooltip")
+
     def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect) -> None:
         super().__init__(parent, rect)
 
@@ -1117,6 +1523,13 @@ class MoneyManager(UIComponent):
 
             self.create_tooltip()
 
+    def set_money(self, money: int, betting: int) -> None:
+        self.money = money
+        self.betting = betting
+        self.last_win = 0
+
+        self.create_tooltip()
+
     def create_tooltip(self) -> None:
         if self.money_tooltip is not None:
             self.money_tooltip.destroy()
@@ -1132,9 +1545,418 @@ class MoneyManager(UIComponent):
         pos_y = int(0.0609375 * self.rect.height)
         width = int(0.2859375 * self.rect.width)
         height = int(0.290625 * self.rect.height)
-        self.money_tooltip = ToolTip(self, (pos_x, pos_y), lines)
+        self.money_tooltip = ToolTip.create(self, (pos_x, pos_y), lines)
         self.money_tooltip.rect.width = width
         self.money_tooltip.rect.height = height
 
+class OddsManager(UIComponent):
+    __slots__ = ("bet_manager", "current_point", "overlays")
+
+    def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect, bet_manager: "BetManager") -> None:
+        super().__init__(parent, rect)
+
+        self.bet_manager = bet_manager
+        self.current_point = 0
+        self.visible = False
+        self.overlays: "dict[int, pygame.Surface]" = {}
+
+    def handle_event(self, event: pygame.event.Event, events_to_post: "list[pygame.event.Event]") -> None:
+        super().handle_event(event, events_to_post)
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_e:
+            self.visible = not self.visible
+
+        elif event.type == PUCK_MANAGER_POINT_SET or event.type == PUCK_MANAGER_POINT_WIN or event.type == PUCK_MANAGER_POINT_LOSE:
+            current_point: int = event.current_point
+
+            self.current_point = current_point
+
+    def render_overlay(self, current_point: int) -> pygame.Surface:
+        overlay = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        font = get_font(18)
+        padding = 2
+
+        for bet, coordinates in self.bet_manager.coordinate_mapping.items():
+            odds = self.bet_manager.get_odds(bet, current_point)
+            text_render = font.render("%.2f%%" % (100 * odds.get_house_edge()), True, (0, 0, 0))
+
+            label_rect = text_render.get_rect()
+            label_rect.center = (int(coordinates[0] * self.rect.width), int(coordinates[1] * self.rect.height) - 20)
+
+            pygame.draw.rect(overlay, (255, 255, 255, 192), label_rect.inflate(padding * 2, padding * 2), 0, 3)
+            overlay.blit(text_render, label_rect)
+
+        return overlay
+
+    def draw(self, surface: pygame.Surface, bounds: pygame.rect.Rect) -> None:
+        if self.current_point not in self.overlays:
+            self.overlays[self.current_point] = self.render_overlay(self.current_point)
+
+        surface.blit(self.overlays[self.current_point], bounds)
+
+        super().draw(surface, bounds)
+
+class WhatIfManager(UIComponent):
+    __slots__ = ("bet_manager", "puck_manager", "money_manager", "rolls", "sessions", "chunk_size", "bin_width", "histogram",
+                 "executor", "cancel_token", "futures", "restart_at", "start_money", "completed", "total_delta", "sessions_up",
+                 "error", "panel_surface", "panel_dirty")
+
+    def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect, bet_manager: "BetManager", puck_manager: "PuckManager", money_manager: "MoneyManager") -> None:
+        pos_x = int(0.684375 * rect.width)
+        pos_y = int(0.3671875 * rect.height)
+        width = int(0.2859375 * rect.width)
+        height = int(0.4 * rect.height)
+        super().__init__(parent, pygame.rect.Rect(pos_x, pos_y, width, height))
+
+        self.bet_manager = bet_manager
+        self.puck_manager = puck_manager
+        self.money_manager = money_manager
+
+        self.rolls = 500
+        self.sessions = 2000
+        self.chunk_size = 50
+        self.bin_width = 2000
+        self.histogram = [0] * 21
+
+        self.visible = False
+        self.executor: concurrent.futures.ProcessPoolExecutor = None
+        self.cancel_token: CancelToken = None
+        self.futures: "list[concurrent.futures.Future]" = []
+        self.restart_at = -1
+        self.start_money = 0
+        self.completed = 0
+        self.total_delta = 0
+        self.sessions_up = 0
+        self.error = ""
+
+        self.panel_surface: pygame.Surface = None
+        self.panel_dirty = True
+
+    def update(self, dt: float) -> None:
+        super().update(dt)
+
+        if self.restart_at >= 0 and self.ms >= self.restart_at:
+            self.restart_at = -1
+            self.start_simulation()
+
+        if self.futures:
+            self.collect_results()
+
+    def handle_event(self, event: pygame.event.Event, events_to_post: "list[pygame.event.Event]") -> None:
+        super().handle_event(event, events_to_post)
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_w:
+            self.visible = not self.visible
+            self.panel_dirty = True
+
+            if self.visible:
+                self.schedule_restart()
+            else:
+                self.cancel_simulation()
+
+        elif event.type == BET_MANAGER_BET_PLACED or event.type == BET_MANAGER_OVERALL_WIN or event.type == BET_MANAGER_OVERALL_LOSE or event.type == BET_MANAGER_OVERALL_PUSH:
+            if self.visible:
+                self.schedule_restart()
+
+    def schedule_restart(self) -> None:
+        self.cancel_simulation()
+        self.restart_at = self.ms + 250
+
+    def cancel_simulation(self) -> None:
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+
+        for future in self.futures:
+            future.cancel()
+
+        self.futures = []
+        self.restart_at = -1
+
+    def start_simulation(self) -> None:
+        bets = dict(self.bet_manager.bets)
+        current_point = self.puck_manager.current_point
+        money = int(round(self.money_manager.money))
+
+        self.start_money = money + sum(bets.values()) * 100
+        self.bin_width = max(100, sum(bets.values()) * 300)
+        self.histogram = [0] * len(self.histogram)
+        self.completed = 0
+        self.total_delta = 0
+        self.sessions_up = 0
+        self.error = ""
+        self.panel_dirty = True
+
+        if not bets:
+            return
+
+        if self.executor is None:
+            self.close_executor()
+            workers = max(1, (os.cpu_count() or 2) - 1)
+            self.executor = concurrent.futures.ProcessPoolExecutor(workers, multiprocessing.get_context("spawn"), lower_worker_priority)
+            self.cancel_token = CancelToken()
+
+        seed = random.randrange(1 << 30)
+        cancel = self.cancel_token.get_spec()
+        for start in range(0, self.sessions, self.chunk_size):
+            future = self.executor.submit(run_sessions, bets, current_point, money, self.rolls, seed + start, self.chunk_size, self.bet_manager.rules, cancel)
+            self.futures.append(future)
+
+    def collect_results(self) -> None:
+        futures: "list[concurrent.futures.Future]" = []
+
+        for future in self.futures:
+            if not future.done():
+                futures.append(future)
+                continue
+
+            try:
+                results = future.result()
+            except Exception as error:
+                self.error = "%s: %s" % (type(error).__name__, error)
+                self.panel_dirty = True
+
+                if isinstance(error, concurrent.futures.BrokenExecutor):
+                    self.close_executor()
+
+                continue
+
+            if results is None:
+                continue
+
+            for final_money in results:
+                delta = final_money - self.start_money
+                index = delta // self.bin_width + len(self.histogram) // 2
+                index = min(max(index, 0), len(self.histogram) - 1)
+
+                self.histogram[index] += 1
+                self.completed += 1
+                self.total_delta += delta
+                if delta > 0:
+                    self.sessions_up += 1
+
+            self.panel_dirty = True
+
+        self.futures = futures
+
+    def is_busy(self) -> bool:
+        return self.restart_at >= 0 or bool(self.futures)
+
+    def shutdown(self) -> None:
+        self.cancel_simulation()
+        self.close_executor()
+
+    def close_executor(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+        if self.cancel_token is not None:
+            self.cancel_token.close()
+            self.cancel_token = None
+
+    def render_panel(self) -> None:
+        padding = 10
+        self.panel_surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        bounds = self.panel_surface.get_rect()
+
+        pygame.draw.rect(self.panel_surface, (255, 255, 255, 192), bounds, 0, 5)
+        pygame.draw.rect(self.panel_surface, (0, 0, 0), bounds, 1, 5)
+
+        lines = ["What If: %d Rolls" % self.rolls]
+        if self.error:
+            lines.append(self.error[:40])
+
+        if self.completed:
+            lines.append("Sessions: %d/%d" % (self.completed, self.sessions))
+            lines.append("Mean: $%.2f" % (self.total_delta / self.completed / 100))
+            lines.append("Ahead: %.1f%%" % (100 * self.sessions_up / self.completed))
+        elif self.futures or self.restart_at >= 0:
+            lines.append("Simulating...")
+        else:
+            lines.append("Place a bet")
+
+        font = get_font(24)
+        top = padding
+        for line in lines:
+            text_render = font.render(line, True, (0, 0, 0))
+            self.panel_surface.blit(text_render, (padding, top))
+            top += text_render.get_height() + 5
+
+        chart_rect = pygame.rect.Rect(padding, top, bounds.width - padding * 2, bounds.height - top - padding)
+        peak = max(self.histogram) or 1
+        bar_width = chart_rect.width / len(self.histogram)
+        middle = len(self.histogram) // 2
+
+        for index, count in enumerate(self.histogram):
+            if index < middle:
+                color = (241, 148, 141)
+            elif index > middle:
+                color = (122, 195, 150)
+            else:
+                color = (131, 131, 131)
+
+            bar_height = int(chart_rect.height * count / peak)
+            bar_rect = pygame.rect.Rect(chart_rect.x + int(index * bar_width), chart_rect.bottom - bar_height, max(1, int(bar_width) - 1), bar_height)
+            pygame.draw.rect(self.panel_surface, color, bar_rect)
+
+        pygame.draw.line(self.panel_surface, (0, 0, 0), chart_rect.bottomleft, chart_rect.bottomright)
+
+        self.panel_dirty = False
+
+    def draw(self, surface: pygame.Surface, bounds: pygame.rect.Rect) -> None:
+        if self.panel_dirty:
+            self.render_panel()
+
+        surface.blit(self.panel_surface, bounds)
+
+        super().draw(surface, bounds)
+
+class HistoryManager(UIComponent):
+    __slots__ = ("money_manager", "rolls", "bankrolls", "strip_rect", "chart_rect", "cell_width", "column_width",
+                 "frame_surface", "strip_surface", "chart_surface", "label_surface", "chart_low", "chart_high", "surfaces_dirty")
+
+    def __init__(self, parent: "UIComponent", rect: pygame.rect.Rect, money_manager: "MoneyManager") -> None:
+        pos_x = int(0.684375 * rect.width)
+        pos_y = int(0.78 * rect.height)
+        width = int(0.2859375 * rect.width)
+        height = int(0.19 * rect.height)
+        super().__init__(parent, pygame.rect.Rect(pos_x, pos_y, width, height))
+
+        self.money_manager = money_manager
+        self.visible = False
+
+        padding = 10
+        self.cell_width = int(0.02 * rect.width)
+        self.column_width = 3
+        self.strip_rect = pygame.rect.Rect(padding, padding, width - padding * 2, self.cell_width)
+        self.chart_rect = pygame.rect.Rect(padding, self.strip_rect.bottom + padding, width - padding * 2, height - self.strip_rect.bottom - padding * 2)
+
+        self.rolls: "collections.deque[list[int]]" = collections.deque(maxlen=self.strip_rect.width // self.cell_width + 1)
+        self.bankrolls: "collections.deque[int]" = collections.deque(maxlen=self.chart_rect.width // self.column_width + 2)
+        self.bankrolls.append(self.get_bankroll())
+
+        self.frame_surface: pygame.Surface = None
+        self.strip_surface: pygame.Surface = None
+        self.chart_surface: pygame.Surface = None
+        self.label_surface: pygame.Surface = None
+        self.chart_low = 0
+        self.chart_high = 0
+        self.surfaces_dirty = True
+
+    def handle_event(self, event: pygame.event.Event, events_to_post: "list[pygame.event.Event]") -> None:
+        super().handle_event(event, events_to_post)
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+            self.visible = not self.visible
+
+        elif event.type == DICE_MANAGER_DICE_ROLLED:
+            dice_values: "list[int]" = event.dice_values
+
+            self.rolls.append(list(dice_values))
+            if not self.surfaces_dirty:
+                self.strip_surface.scroll(-self.cell_width, 0)
+                self.draw_roll_cell(len(self.rolls) - 1)
+
+        elif event.type == BET_MANAGER_OVERALL_WIN or event.type == BET_MANAGER_OVERALL_LOSE or event.type == BET_MANAGER_OVERALL_PUSH:
+            bankroll = self.get_bankroll()
+
+            self.bankrolls.append(bankroll)
+            if not self.surfaces_dirty:
+                if self.chart_low <= bankroll <= self.chart_high:
+                    self.chart_surface.scroll(-self.column_width, 0)
+                    self.draw_chart_column(len(self.bankrolls) - 1)
+                else:
+                    self.render_chart()
+
+                self.render_label()
+
+    def get_bankroll(self) -> int:
+        return int(round(self.money_manager.money + self.money_manager.betting))
+
+    def get_chart_y(self, bankroll: int) -> int:
+        scale = (bankroll - self.chart_low) / max(self.chart_high - self.chart_low, 1)
+        return int((self.chart_rect.height - 1) * (1 - scale))
+
+    def draw_roll_cell(self, index: int) -> None:
+        dice_values = self.rolls[index]
+        dice_total = sum(dice_values)
+        cell_rect = pygame.rect.Rect(self.strip_rect.width - (len(self.rolls) - index) * self.cell_width, 0, self.cell_width, self.cell_width)
+
+        if dice_total == 7:
+            color = (241, 148, 141)
+        elif dice_total in POINTS:
+            color = (122, 195, 150)
+        else:
+            color = (244, 224, 137)
+
+        pygame.draw.rect(self.strip_surface, (255, 255, 255, 0), cell_rect)
+        pygame.draw.rect(self.strip_surface, color, cell_rect.inflate(-2, -2), 0, 3)
+
+        text_render = get_font(int(0.8 * self.cell_width)).render("%d" % dice_total, True, (0, 0, 0))
+        self.strip_surface.blit(text_render, text_render.get_rect(center=cell_rect.center))
+
+    def draw_chart_column(self, index: int) -> None:
+        right = self.chart_rect.width - 1 - (len(self.bankrolls) - 1 - index) * self.column_width
+        column_rect = pygame.rect.Rect(right - self.column_width + 1, 0, self.column_width, self.chart_rect.height)
+        pygame.draw.rect(self.chart_surface, (255, 255, 255, 0), column_rect)
+
+        if index > 0:
+            start = self.bankrolls[index - 1]
+            end = self.bankrolls[index]
+            color = (122, 195, 150) if end >= start else (241, 148, 141)
+            pygame.draw.line(self.chart_surface, color, (right - self.column_width, self.get_chart_y(start)), (right, self.get_chart_y(end)), 2)
+
+    def render_strip(self) -> None:
+        self.strip_surface = pygame.Surface(self.strip_rect.size, pygame.SRCALPHA)
+
+        for index in range(len(self.rolls)):
+            self.draw_roll_cell(index)
+
+    def render_chart(self) -> None:
+        low = min(self.bankrolls)
+        high = max(self.bankrolls)
+        margin = max(1000, (high - low) // 4)
+        self.chart_low = low - margin
+        self.chart_high = high + margin
+
+        self.chart_surface = pygame.Surface(self.chart_rect.size, pygame.SRCALPHA)
+        for index in range(len(self.bankrolls)):
+            self.draw_chart_column(index)
+
+    def render_label(self) -> None:
+        self.label_surface = get_font(20).render("Bank: $%.2f" % (self.bankrolls[-1] / 100), True, (0, 0, 0))
+
+    def render_frame(self) -> None:
+        self.frame_surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        bounds = self.frame_surface.get_rect()
+
+        pygame.draw.rect(self.frame_surface, (255, 255, 255, 192), bounds, 0, 5)
+        pygame.draw.rect(self.frame_surface, (0, 0, 0), bounds, 1, 5)
+        pygame.draw.rect(self.frame_surface, (255, 255, 255, 240), self.chart_rect)
+        pygame.draw.line(self.frame_surface, (0, 0, 0), self.chart_rect.bottomleft, self.chart_rect.bottomright)
+
+    def draw(self, surface: pygame.Surface, bounds: pygame.rect.Rect) -> None:
+        if self.surfaces_dirty:
+            self.render_frame()
+            self.render_strip()
+            self.render_chart()
+            self.render_label()
+            self.surfaces_dirty = False
+
+        surface.blit(self.frame_surface, bounds)
+        surface.blit(self.strip_surface, self.strip_rect.move(bounds.topleft))
+        surface.blit(self.chart_surface, self.chart_rect.move(bounds.topleft))
+        surface.blit(self.label_surface, self.chart_rect.move(bounds.topleft).topleft)
+
+        super().draw(surface, bounds)
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Play craps.")
+    parser.add_argument("--rules", default="standard")
+    parser.add_argument("--metrics-port", type=int, default=0, help="Serve Prometheus metrics on this local port")
+    args = parser.parse_args(argv)
+
+    run(args.rules, args.metrics_port)
+
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    main()
\ No newline at end of file
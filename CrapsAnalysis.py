@@ -0,0 +1,282 @@
+import argparse
+import math
+
+import numpy
+
+from CrapsRules import WIN, LOSE, STATES, STATE_INDEX, get_dice_outcomes, get_settlement_table, next_point
+from CrapsSimulation import parse_bets
+
+def get_roll_deltas(bets: "dict[str, int]", rules: str = "standard") -> "dict[int, list[tuple[int, int, float]]]":
+    settlement_table = get_settlement_table(rules)
+    outcomes = get_dice_outcomes()
+    probability = 1 / len(outcomes)
+    deltas: "dict[int, list[tuple[int, int, float]]]" = {}
+
+    for state in STATES:
+        deltas[state] = []
+
+        for dice_values in outcomes:
+            dice_total = sum(dice_values)
+            delta = 0
+
+            for bet, amount in bets.items():
+                outcome, win, to = settlement_table.settle(bet, state, dice_values)
+
+                if outcome == WIN:
+                    delta += amount * 100 * win // to
+                elif outcome == LOSE:
+                    delta -= amount * 100
+
+            deltas[state].append((delta, next_point(state, dice_total), probability))
+
+    return deltas
+
+def build_transitions(deltas: "dict[int, list[tuple[int, int, float]]]", unit: int) -> "list[tuple[int, numpy.ndarray]]":
+    matrices: "dict[int, numpy.ndarray]" = {}
+
+    for state, outcomes in deltas.items():
+        for delta, next_state, probability in outcomes:
+            if delta // unit not in matrices:
+                matrices[delta // unit] = numpy.zeros((len(STATES), len(STATES)))
+
+            matrices[delta // unit][STATE_INDEX[next_state], STATE_INDEX[state]] += probability
+
+    return sorted(matrices.items())
+
+class RuinResult:
+    def __init__(self, bankrolls: numpy.ndarray, ruin_times: numpy.ndarray, target_times: numpy.ndarray, final_distribution: numpy.ndarray) -> None:
+        self.bankrolls = bankrolls
+        self.ruin_times = ruin_times
+        self.target_times = target_times
+        self.final_distribution = final_distribution
+
+        self.ruin_probability = float(ruin_times.sum())
+        self.target_probability = float(target_times.sum())
+        self.survival_probability = float(final_distribution.sum())
+        self.rolls = len(ruin_times)
+
+    def get_ruin_time_quantile(self, quantile: float) -> int:
+        cumulative = numpy.cumsum(self.ruin_times)
+        if not len(cumulative) or cumulative[-1] < quantile * self.ruin_probability:
+            return -1
+
+        return int(numpy.searchsorted(cumulative, quantile * self.ruin_probability)) + 1
+
+    def get_expected_rolls(self) -> float:
+        rolls = numpy.arange(1, self.rolls + 1)
+        return float(((self.ruin_times + self.target_times) * rolls).sum() + self.survival_probability * self.rolls)
+
+class RuinSolver:
+    def __init__(self, bets: "dict[str, int]", money: int = 10000, target: int = 20000, ruin: int = -1, rules: str = "standard") -> None:
+        self.bets = dict(bets)
+        self.money = money
+        self.target = target
+        if ruin < 0:
+            ruin = sum(self.bets.values()) * 100
+        self.ruin = ruin
+
+        if not self.bets:
+            raise RuntimeError("At least one bet is required")
+
+        if not self.ruin <= self.money < self.target:
+            raise RuntimeError("Bankroll must be between the ruin level and the target")
+
+        deltas = get_roll_deltas(self.bets, rules)
+        self.unit = math.gcd(self.money - self.ruin, self.target - self.ruin, *[delta for outcomes in deltas.values() for delta, next_state, probability in outcomes])
+        self.transitions = build_transitions(deltas, self.unit)
+
+    def get_bankrolls(self) -> numpy.ndarray:
+        return numpy.arange(self.ruin, self.target, self.unit)
+
+    def step(self, probabilities: numpy.ndarray) -> "tuple[numpy.ndarray, float, float]":
+        size = probabilities.shape[1]
+        result = numpy.zeros_like(probabilities)
+        ruined = 0.0
+        reached = 0.0
+
+        for delta, matrix in self.transitions:
+            moved = matrix @ probabilities
+
+            if delta >= 0:
+                result[:, delta:] += moved[:, :size - delta]
+                reached += moved[:, size - delta:].sum()
+            else:
+                result[:, :delta] += moved[:, -delta:]
+                ruined += moved[:, :-delta].sum()
+
+        return result, ruined, reached
+
+    def solve(self, max_rolls: int = 100000, tolerance: float = 1e-12, block_rolls: int = 16) -> RuinResult:
+        bankrolls = self.get_bankrolls()
+        probabilities = numpy.zeros((len(STATES), len(bankrolls)))
+        probabilities[STATE_INDEX[0], (self.money - self.ruin) // self.unit] = 1.0
+
+        ruin_times: "list[float]" = []
+        target_times: "list[float]" = []
+        spectra: "dict[tuple[int, int], numpy.ndarray]" = {}
+
+        while len(ruin_times) < max_rolls:
+            probabilities, block_ruin_times, block_target_times = self.advance(probabilities, min(block_rolls, max_rolls - len(ruin_times)), spectra)
+            ruin_times.extend(block_ruin_times)
+            target_times.extend(block_target_times)
+
+            if probabilities.sum() < tolerance:
+                break
+
+        return RuinResult(bankrolls, numpy.array(ruin_times), numpy.array(target_times), probabilities.sum(axis=0))
+
+    def get_kernel_spectrum(self, rolls: int, size: int) -> numpy.ndarray:
+        low = self.transitions[0][0]
+
+        kernel = numpy.zeros((len(STATES), len(STATES), size))
+        for delta, matrix in self.transitions:
+            kernel[:, :, delta - low] += matrix
+
+        return numpy.linalg.matrix_power(numpy.fft.rfft(kernel, axis=2).transpose(2, 0, 1), rolls)
+
+    def advance(self, probabilities: numpy.ndarray, rolls: int, spectra: "dict[tuple[int, int], numpy.ndarray]") -> "tuple[numpy.ndarray, list[float], list[float]]":
+        size = probabilities.shape[1]
+        low = self.transitions[0][0]
+        high = self.transitions[-1][0]
+        near_ruin = rolls * max(0, -low)
+        near_target = rolls * max(0, high)
+        width = near_ruin + near_target
+
+        if rolls == 1 or 2 * width >= size:
+            ruin_times: "list[float]" = []
+            target_times: "list[float]" = []
+            for roll in range(rolls):
+                probabilities, ruined, reached = self.step(probabilities)
+                ruin_times.append(ruined)
+                target_times.append(reached)
+
+            return probabilities, ruin_times, target_times
+
+        interior = probabilities[:, near_ruin:size - near_target]
+        length = interior.shape[1] + rolls * (high - low)
+        fft_size = 1 << (length - 1).bit_length()
+        if (rolls, fft_size) not in spectra:
+            spectra[(rolls, fft_size)] = self.get_kernel_spectrum(rolls, fft_size)
+
+        spectrum = numpy.fft.rfft(interior, fft_size, axis=1).T[:, :, None]
+        moved = numpy.fft.irfft((spectra[(rolls, fft_size)] @ spectrum)[:, :, 0].T, fft_size, axis=1)[:, :length]
+
+        result = numpy.zeros_like(probabilities)
+        offset = near_ruin + rolls * low
+        result[:, offset:offset + length] += numpy.clip(moved, 0.0, None)
+
+        ruin_window = numpy.zeros((len(STATES), width))
+        ruin_window[:, :near_ruin] = probabilities[:, :near_ruin]
+        target_window = numpy.zeros((len(STATES), width))
+        target_window[:, width - near_target:] = probabilities[:, size - near_target:]
+
+        ruin_times = []
+        target_times = []
+        for roll in range(rolls):
+            ruin_window, ruined, unreached = self.step(ruin_window)
+            target_window, unruined, reached = self.step(target_window)
+            ruin_times.append(ruined)
+            target_times.append(reached)
+
+        result[:, :width] += ruin_window
+        result[:, size - width:] += target_window
+
+        return result, ruin_times, target_times
+
+class BankrollDistribution:
+    def __init__(self, bankrolls: numpy.ndarray, probabilities: numpy.ndarray, point_probabilities: numpy.ndarray, ruin_probability: float, pruned_probability: float, rolls: int) -> None:
+        self.bankrolls = bankrolls
+        self.probabilities = probabilities
+        self.point_probabilities = point_probabilities
+        self.ruin_probability = ruin_probability
+        self.pruned_probability = pruned_probability
+        self.rolls = rolls
+
+    def get_mean(self) -> float:
+        return float((self.bankrolls * self.probabilities).sum() / self.probabilities.sum())
+
+    def get_quantile(self, quantile: float) -> int:
+        cumulative = numpy.cumsum(self.probabilities)
+        return int(self.bankrolls[min(int(numpy.searchsorted(cumulative, quantile * cumulative[-1])), len(cumulative) - 1)])
+
+    def get_probability_above(self, money: int) -> float:
+        return float(self.probabilities[self.bankrolls > money].sum())
+
+def get_bankroll_distribution(bets: "dict[str, int]", money: int, rolls: int, ruin: int = -1, tolerance: float = 1e-12, rules: str = "standard") -> BankrollDistribution:
+    if not bets:
+        raise RuntimeError("At least one bet is required")
+
+    if ruin < 0:
+        ruin = sum(bets.values()) * 100
+
+    if money < ruin:
+        raise RuntimeError("Bankroll must be at least the ruin level")
+
+    deltas = get_roll_deltas(bets, rules)
+    unit = math.gcd(money - ruin, *[delta for outcomes in deltas.values() for delta, next_state, probability in outcomes]) or 1
+    transitions = build_transitions(deltas, unit)
+    low = min(delta for delta, matrix in transitions)
+    high = max(delta for delta, matrix in transitions)
+
+    start = (money - ruin) // unit
+    probabilities = numpy.zeros((len(STATES), 1))
+    probabilities[STATE_INDEX[0], 0] = 1.0
+    ruined = 0.0
+    pruned = 0.0
+
+    for roll in range(rolls):
+        width = probabilities.shape[1]
+        result = numpy.zeros((len(STATES), width + high - low))
+
+        for delta, matrix in transitions:
+            result[:, delta - low:delta - low + width] += matrix @ probabilities
+
+        start += low
+        if start < 0:
+            ruined += result[:, :-start].sum()
+            result = result[:, -start:]
+            start = 0
+
+        totals = result.sum(axis=0)
+        cumulative = numpy.cumsum(totals)
+        first = int(numpy.searchsorted(cumulative, tolerance / 2, side="right"))
+        last = len(totals) - int(numpy.searchsorted(numpy.cumsum(totals[::-1]), tolerance / 2, side="right"))
+
+        pruned += cumulative[-1] - totals[first:last].sum()
+        probabilities = result[:, first:last]
+        start += first
+
+    bankrolls = ruin + (numpy.arange(probabilities.shape[1]) + start) * unit
+    return BankrollDistribution(bankrolls, probabilities.sum(axis=0), probabilities.sum(axis=1), ruined, pruned, rolls)
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Solve risk of ruin for a fixed craps betting layout.")
+    parser.add_argument("--bet", action="append", default=[], help='Bet and amount in dollars, e.g. "Pass Line=5"')
+    parser.add_argument("--money", type=int, default=10000, help="Starting bankroll in cents")
+    parser.add_argument("--target", type=int, default=20000, help="Target bankroll in cents")
+    parser.add_argument("--rules", default="standard")
+    parser.add_argument("--max-rolls", type=int, default=100000)
+    parser.add_argument("--tolerance", type=float, default=1e-12)
+    parser.add_argument("--block-rolls", type=int, default=16, help="Advance interior bankrolls this many rolls at a time with one FFT convolution")
+    parser.add_argument("--rolls", type=int, default=0, help="Also print the bankroll distribution after this many rolls")
+    args = parser.parse_args(argv)
+
+    solver = RuinSolver(parse_bets(args.bet or ["Pass Line=5"]), args.money, args.target, rules=args.rules)
+    result = solver.solve(args.max_rolls, args.tolerance, max(1, args.block_rolls))
+
+    print("Ruin: %.6f" % result.ruin_probability)
+    print("Target: %.6f" % result.target_probability)
+    print("Unresolved: %.6g after %d rolls" % (result.survival_probability, result.rolls))
+    print("Expected Rolls: %.1f" % result.get_expected_rolls())
+    print("Ruin Time Quartiles: %d %d %d" % tuple(result.get_ruin_time_quantile(quantile) for quantile in (0.25, 0.5, 0.75)))
+
+    if args.rolls:
+        distribution = get_bankroll_distribution(solver.bets, args.money, args.rolls, solver.ruin, args.tolerance, args.rules)
+        print("Ruin Within %d Rolls: %.6f" % (args.rolls, distribution.ruin_probability))
+        print("Mean Surviving Bankroll After %d Rolls: $%.2f" % (args.rolls, distribution.get_mean() / 100))
+        print("Bankroll Quartiles: $%.2f $%.2f $%.2f" % tuple(distribution.get_quantile(quantile) / 100 for quantile in (0.25, 0.5, 0.75)))
+        print("P(Bankroll > Start): %.6f" % distribution.get_probability_above(args.money))
+        print("Pruned: %.3g" % distribution.pruned_probability)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import concurrent.futures
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+
+from CrapsSimulation import STOP_BUST, Strategy, lower_worker_priority, parse_bets, simulate
+from CrapsState import RunProgress, TableState, read_checkpoint, save_checkpoint
+
+def run_chunk(config: dict, start: int, count: int, seed: int, rolls: int, rules: str, money: int) -> "list[dict]":
+    results: "list[dict]" = []
+
+    for session in range(start, start + count):
+        result = simulate(config, seed + session, rolls, rules, money).to_dict()
+        result["session"] = session
+        result["seed"] = seed + session
+        results.append(result)
+
+    return results
+
+def get_chunks(sessions: int, chunk_size: int) -> "list[tuple[int, int]]":
+    return [(start, min(chunk_size, sessions - start)) for start in range(0, sessions, chunk_size)]
+
+class Progress:
+    def __init__(self, sessions: int, interval: float = 0.5) -> None:
+        self.sessions = sessions
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.last_report = 0.0
+        self.completed = 0
+        self.rolls = 0
+
+    def add(self, results: "list[dict]") -> None:
+        self.completed += len(results)
+        self.rolls += sum(result["rolls"] for result in results)
+
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval or self.completed == self.sessions:
+            self.last_report = now
+            self.report(now)
+
+    def report(self, now: float) -> None:
+        elapsed = max(now - self.start, 1e-9)
+        sys.stderr.write("\r%d/%d sessions, %d rolls, %.0f rolls/sec" % (self.completed, self.sessions, self.rolls, self.rolls / elapsed))
+        if self.completed == self.sessions:
+            sys.stderr.write(" (%.2fs)\n" % elapsed)
+        sys.stderr.flush()
+
+def summarize_chunk(results: "list[dict]") -> dict:
+    final_bankrolls = [result["money"] for result in results]
+
+    return {
+        "first_session": results[0]["session"],
+        "sessions": len(results),
+        "rolls": sum(result["rolls"] for result in results),
+        "wagered": sum(result["wagered"] for result in results),
+        "mean_money": sum(final_bankrolls) / len(final_bankrolls),
+        "min_money": min(final_bankrolls),
+        "max_money": max(final_bankrolls),
+        "busts": sum(result["stop_reason"] == STOP_BUST for result in results)
+    }
+
+class Checkpoint:
+    def __init__(self, path: str, parameters: dict, interval: float = 30.0) -> None:
+        self.path = path
+        self.state = TableState(0, parameters["money"], parameters["config"]["bets"], parameters["rules"])
+        self.progress = RunProgress(hashlib.sha256(json.dumps(parameters, sort_keys=True).encode("utf-8")).digest())
+        self.interval = interval
+        self.rolls = 0
+        self.last_save = time.perf_counter()
+
+    def load(self) -> None:
+        state, rng, rolls, progress = read_checkpoint(self.path)
+
+        if state != self.state or progress is None or progress.digest != self.progress.digest:
+            raise RuntimeError("Checkpoint %s was written for a different run" % self.path)
+
+        self.progress = progress
+        self.rolls = rolls
+
+    def add(self, start: int, file: io.TextIOBase, rolls: int) -> None:
+        self.progress.completed.add(start)
+        self.rolls += rolls
+        if file.seekable():
+            self.progress.offset = file.tell()
+
+        if time.perf_counter() - self.last_save >= self.interval:
+            self.save()
+
+    def save(self) -> None:
+        save_checkpoint(self.path, self.state, None, self.rolls, self.progress)
+        self.last_save = time.perf_counter()
+
+def write_results(file: io.TextIOBase, results: "list[dict]", per_chunk: bool = False) -> None:
+    if per_chunk:
+        results = [summarize_chunk(results)]
+
+    for result in results:
+        file.write(json.dumps(result, sort_keys=True))
+        file.write("\n")
+
+    file.flush()
+
+def finish_chunk(file: io.TextIOBase, start: int, results: "list[dict]", per_chunk: bool, progress: Progress, checkpoint: Checkpoint) -> None:
+    write_results(file, results, per_chunk)
+
+    if checkpoint is not None:
+        checkpoint.add(start, file, sum(result["rolls"] for result in results))
+    if progress is not None:
+        progress.add(results)
+
+def run_batch(config: dict, sessions: int, rolls: int, seed: int, rules: str, money: int, workers: int, chunk_size: int, file: io.TextIOBase, progress: Progress = None, per_chunk: bool = False, checkpoint: Checkpoint = None) -> None:
+    chunks = get_chunks(sessions, chunk_size)
+    if checkpoint is not None:
+        chunks = [(start, count) for start, count in chunks if start not in checkpoint.progress.completed]
+
+    if workers <= 1:
+        for start, count in chunks:
+            finish_chunk(file, start, run_chunk(config, start, count, seed, rolls, rules, money), per_chunk, progress, checkpoint)
+
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=lower_worker_priority) as executor:
+        pending: "dict[concurrent.futures.Future, int]" = {}
+        chunks.reverse()
+
+        while chunks or pending:
+            while chunks and len(pending) < workers * 2:
+                start, count = chunks.pop()
+                pending[executor.submit(run_chunk, config, start, count, seed, rolls, rules, money)] = start
+
+            done, not_done = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                finish_chunk(file, pending.pop(future), future.result(), per_chunk, progress, checkpoint)
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate craps sessions headlessly and stream JSON Lines results.")
+    parser.add_argument("--bet", action="append", default=[], help='Bet and amount in dollars, e.g. "Pass Line=5"')
+    parser.add_argument("--stop-loss", type=int, default=0, help="Stop a session after losing this many dollars")
+    parser.add_argument("--stop-win", type=int, default=0, help="Stop a session after winning this many dollars")
+    parser.add_argument("--rules", default="standard")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rolls", type=int, default=1000, help="Rolls per session")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--money", type=int, default=10000, help="Starting bankroll in cents")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=10, help="Sessions per worker task")
+    parser.add_argument("--output", default="-", help="JSON Lines output path")
+    parser.add_argument("--per-chunk", action="store_true", help="Write one summary line per chunk instead of one line per session")
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress on stderr")
+    parser.add_argument("--checkpoint", help="Record completed chunks in this file so an interrupted run can be resumed")
+    parser.add_argument("--checkpoint-interval", type=float, default=30.0, help="Seconds between checkpoint writes")
+    parser.add_argument("--resume", action="store_true", help="Skip chunks recorded in --checkpoint and append to --output")
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
+
+    config = Strategy(parse_bets(args.bet or ["Pass Line=5"]), args.stop_loss, args.stop_win).to_config()
+    chunk_size = max(1, args.chunk_size)
+
+    checkpoint = None
+    if args.checkpoint:
+        parameters = {"config": config, "sessions": args.sessions, "rolls": args.rolls, "seed": args.seed, "rules": args.rules, "money": args.money, "chunk_size": chunk_size, "per_chunk": args.per_chunk}
+        checkpoint = Checkpoint(args.checkpoint, parameters, args.checkpoint_interval)
+        if args.resume and os.path.exists(args.checkpoint):
+            checkpoint.load()
+
+    progress = None
+    if not args.quiet:
+        progress = Progress(args.sessions)
+        if checkpoint is not None:
+            progress.completed = sum(count for start, count in get_chunks(args.sessions, chunk_size) if start in checkpoint.progress.completed)
+            progress.rolls = checkpoint.rolls
+
+    if args.output == "-":
+        file = sys.stdout
+    elif checkpoint is not None and checkpoint.progress.completed:
+        file = open(args.output, "r+")
+        file.truncate(checkpoint.progress.offset)
+        file.seek(checkpoint.progress.offset)
+    else:
+        file = open(args.output, "w")
+
+    try:
+        run_batch(config, args.sessions, args.rolls, args.seed, args.rules, args.money, max(1, args.workers), chunk_size, file, progress, args.per_chunk, checkpoint)
+    except BrokenPipeError:
+        sys.stdout = None
+        sys.stderr.write("\nOutput closed, stopping\n")
+    except KeyboardInterrupt:
+        sys.stderr.write("\nInterrupted\n")
+    finally:
+        if checkpoint is not None:
+            checkpoint.save()
+        if file is not sys.stdout:
+            file.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import contextlib
+import gc
+import io
+import os
+import random
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import Craps
+
+POOLED_CLASSES = [Craps.Chip, Craps.Text, Craps.MultiLineText, Craps.Dice, Craps.ToolTip]
+
+def post_mouse(event_type: int, pos: "tuple[int, int]") -> None:
+    if event_type == pygame.MOUSEMOTION:
+        pygame.event.post(pygame.event.Event(event_type, {"pos": pos, "rel": (0, 0), "buttons": (0, 0, 0)}))
+    else:
+        pygame.event.post(pygame.event.Event(event_type, {"pos": pos, "button": 1}))
+
+def run_session(frames: int, seed: int, pool_limit: int) -> dict:
+    Craps.POOL_LIMIT = pool_limit
+    for cls in POOLED_CLASSES:
+        cls.pool.clear()
+
+    craps = Craps.Craps("Craps Benchmark", (1280, 1280 // 2))
+    rng = random.Random(seed)
+    bets = list(craps.bet_manager.coordinate_mapping.values())
+
+    gc.collect()
+    collections_before = sum(stat["collections"] for stat in gc.get_stats())
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in range(frames):
+            bet = rng.choice(bets)
+            bet_pos = (int(bet[0] * craps.screen_rect.width), int(bet[1] * craps.screen_rect.height))
+
+            post_mouse(pygame.MOUSEMOTION, (rng.randrange(craps.screen_rect.width), rng.randrange(craps.screen_rect.height)))
+            post_mouse(pygame.MOUSEMOTION, bet_pos)
+
+            if frame % 10 == 0:
+                post_mouse(pygame.MOUSEBUTTONDOWN, bet_pos)
+
+            if frame % 10 == 5:
+                post_mouse(pygame.MOUSEBUTTONDOWN, craps.dice_manager.dice_set.rect.center)
+
+            craps.step(1000 // craps.fps)
+
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections_after = sum(stat["collections"] for stat in gc.get_stats())
+
+    return {
+        "pool_limit": pool_limit,
+        "frames": frames,
+        "seconds": elapsed,
+        "current_kib": current / 1024,
+        "peak_kib": peak / 1024,
+        "gc_collections": collections_after - collections_before,
+        "pooled": sum(len(cls.pool) for cls in POOLED_CLASSES)
+    }
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure UI allocation pressure over a scripted play session.")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pool_limit = Craps.POOL_LIMIT
+    for limit in (0, pool_limit):
+        result = run_session(args.frames, args.seed, limit)
+        print("pool_limit=%(pool_limit)d frames=%(frames)d seconds=%(seconds).2f current=%(current_kib).1fKiB peak=%(peak_kib).1fKiB gc=%(gc_collections)d pooled=%(pooled)d" % result)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import argparse
+import bisect
+import collections
+import http.server
+import threading
+import time
+from typing import Callable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001)
+FRAME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.0167, 0.025, 0.05, 0.1, 0.25)
+
+def escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    __slots__ = ("name", "help", "label", "values")
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, label: str = None) -> None:
+        self.name = name
+        self.help = help
+        self.label = label
+        self.values: "dict[str, float]" = {}
+
+    def inc(self, amount: float = 1, label_value: str = "") -> None:
+        values = self.values
+        values[label_value] = values.get(label_value, 0) + amount
+
+    def get(self, label_value: str = "") -> float:
+        return self.values.get(label_value, 0)
+
+    def get_samples(self) -> "list[tuple[str, str, float]]":
+        values = dict(self.values)
+        if not values and self.label is None:
+            values[""] = 0
+
+        return [(self.name, self.get_labels(label_value), value) for label_value, value in sorted(values.items())]
+
+    def get_labels(self, label_value: str) -> str:
+        if self.label is None:
+            return ""
+
+        return "{%s=\"%s\"}" % (self.label, escape_label(label_value))
+
+class Gauge(Counter):
+    __slots__ = ("function",)
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, label: str = None, function: "Callable[[], object]" = None) -> None:
+        super().__init__(name, help, label)
+        self.function = function
+
+    def set(self, value: float, label_value: str = "") -> None:
+        self.values[label_value] = value
+
+    def get_samples(self) -> "list[tuple[str, str, float]]":
+        if self.function is not None:
+            value = self.function()
+            self.values = dict(value) if isinstance(value, dict) else {"": value}
+
+        return super().get_samples()
+
+class Histogram:
+    __slots__ = ("name", "help", "bounds", "counts", "sum")
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: "tuple[float, ...]") -> None:
+        if list(buckets) != sorted(set(buckets)):
+            raise RuntimeError("Histogram buckets must be increasing: %s" % name)
+
+        self.name = name
+        self.help = help
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def get_count(self) -> int:
+        return sum(self.counts)
+
+    def get_samples(self) -> "list[tuple[str, str, float]]":
+        counts = list(self.counts)
+        total = self.sum
+        samples: "list[tuple[str, str, float]]" = []
+        cumulative = 0
+
+        for bound, count in zip(self.bounds + (float("inf"),), counts):
+            cumulative += count
+            samples.append((self.name + "_bucket", "{le=\"%s\"}" % format_value(bound), cumulative))
+
+        samples.append((self.name + "_sum", "", total))
+        samples.append((self.name + "_count", "", cumulative))
+
+        return samples
+
+class Rate:
+    __slots__ = ("name", "help", "window", "per", "times")
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, window: float = 60.0, per: float = 60.0) -> None:
+        self.name = name
+        self.help = help
+        self.window = window
+        self.per = per
+        self.times: "collections.deque[float]" = collections.deque()
+
+    def mark(self) -> None:
+        now = time.monotonic()
+        times = self.times
+        times.append(now)
+
+        cutoff = now - self.window
+        while times[0] < cutoff:
+            times.popleft()
+
+    def get(self, now: float = None) -> float:
+        if now is None:
+            now = time.monotonic()
+
+        times = list(self.times)
+        return (len(times) - bisect.bisect_left(times, now - self.window)) * self.per / self.window
+
+    def get_samples(self) -> "list[tuple[str, str, float]]":
+        return [(self.name, "", self.get())]
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.metrics: "dict[str, Counter | Gauge | Histogram | Rate]" = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric: "Counter | Gauge | Histogram | Rate") -> "Counter | Gauge | Histogram | Rate":
+        with self.lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise RuntimeError("Metric %s is already registered as a %s" % (metric.name, existing.kind))
+
+                return existing
+
+            self.metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, label: str = None) -> Counter:
+        return self.register(Counter(name, help, label))
+
+    def gauge(self, name: str, help: str, label: str = None, function: "Callable[[], object]" = None) -> Gauge:
+        gauge = self.register(Gauge(name, help, label, function))
+        if function is not None:
+            gauge.function = function
+
+        return gauge
+
+    def histogram(self, name: str, help: str, buckets: "tuple[float, ...]") -> Histogram:
+        return self.register(Histogram(name, help, buckets))
+
+    def rate(self, name: str, help: str, window: float = 60.0, per: float = 60.0) -> Rate:
+        return self.register(Rate(name, help, window, per))
+
+    def expose(self) -> str:
+        with self.lock:
+            metrics = sorted(self.metrics.values(), key=lambda metric: metric.name)
+
+        lines: "list[str]" = []
+        for metric in metrics:
+            lines.append("# HELP %s %s" % (metric.name, metric.help.replace("\\", "\\\\").replace("\n", "\\n")))
+            lines.append("# TYPE %s %s" % (metric.name, metric.kind))
+
+            for name, labels, value in metric.get_samples():
+                lines.append("%s%s %s" % (name, labels, format_value(value)))
+
+        return "\n".join(lines) + "\n"
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    registry: MetricsRegistry = None
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        body = self.registry.expose().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+def start_server(port: int, metrics_registry: MetricsRegistry, host: str = "127.0.0.1") -> http.server.ThreadingHTTPServer:
+    handler = type("MetricsHandler", (MetricsHandler,), {"registry": metrics_registry})
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+
+    return server
+
+def measure(operation: "Callable[[], None]", iterations: int) -> float:
+    start = time.perf_counter()
+    for iteration in range(iterations):
+        operation()
+
+    baseline_start = time.perf_counter()
+    for iteration in range(iterations):
+        pass
+
+    end = time.perf_counter()
+    return max(0.0, (baseline_start - start) - (end - baseline_start)) / iterations * 1e9
+
+def run_benchmark(iterations: int) -> "dict[str, float]":
+    metrics = MetricsRegistry()
+    counter = metrics.counter("benchmark_total", "Benchmark counter")
+    labelled = metrics.counter("benchmark_labelled_total", "Benchmark labelled counter", "bet")
+    gauge = metrics.gauge("benchmark_gauge", "Benchmark gauge")
+    histogram = metrics.histogram("benchmark_seconds", "Benchmark histogram", LATENCY_BUCKETS)
+    rate = metrics.rate("benchmark_per_minute", "Benchmark rate")
+    perf_counter = time.perf_counter
+
+    def timed() -> None:
+        start = perf_counter()
+        histogram.observe(perf_counter() - start)
+
+    return {
+        "counter_inc": measure(counter.inc, iterations),
+        "labelled_counter_inc": measure(lambda: labelled.inc(1, "Pass Line"), iterations),
+        "gauge_set": measure(lambda: gauge.set(5), iterations),
+        "histogram_observe": measure(lambda: histogram.observe(0.00003), iterations),
+        "rate_mark": measure(rate.mark, iterations),
+        "timed_histogram_observe": measure(timed, iterations)
+    }
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure metric update overhead.")
+    parser.add_argument("--iterations", type=int, default=1000000)
+    args = parser.parse_args(argv)
+
+    for operation, nanoseconds in run_benchmark(args.iterations).items():
+        print("%s: %.0f ns" % (operation, nanoseconds))
+
+if __name__ == "__main__":
+    main()
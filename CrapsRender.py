@@ -0,0 +1,199 @@
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import os
+import random
+import struct
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import Craps
+from CrapsSimulation import Simulation, Strategy, lower_worker_priority, parse_bets, roll_dice
+from CrapsState import TableState
+
+DICE_FORMAT = struct.Struct("<BB")
+
+renderers: "dict[tuple[tuple[int, int], str], TableRenderer]" = {}
+
+def record_session(strategy: Strategy, rolls: int, seed: int = 0, rules: str = "standard", money: int = 10000) -> "list[tuple[list[int], TableState]]":
+    rng = random.Random(seed)
+    simulation = Simulation(strategy, rules, money)
+    frames: "list[tuple[list[int], TableState]]" = []
+
+    for roll in range(rolls):
+        simulation.place_bets()
+        if not simulation.bets:
+            break
+
+        dice_values = roll_dice(rng)
+        simulation.roll(dice_values)
+        frames.append((dice_values, simulation.get_state()))
+
+    return frames
+
+def write_recording(path: str, frames: "list[tuple[list[int], TableState]]") -> None:
+    with open(path, "wb") as file:
+        for dice_values, state in frames:
+            file.write(DICE_FORMAT.pack(*dice_values))
+            file.write(state.to_bytes())
+
+def read_recording(path: str) -> "list[tuple[list[int], TableState]]":
+    with open(path, "rb") as file:
+        data = file.read()
+
+    frames: "list[tuple[list[int], TableState]]" = []
+    offset = 0
+
+    while offset < len(data):
+        dice_values = list(DICE_FORMAT.unpack_from(data, offset))
+        state, offset = TableState.from_bytes(data, offset + DICE_FORMAT.size)
+        frames.append((dice_values, state))
+
+    return frames
+
+class TableRenderer:
+    def __init__(self, size: "tuple[int, int]", rules: str = "standard") -> None:
+        pygame.init()
+
+        self.size = size
+        self.rules = rules
+        self.surface = pygame.Surface(size)
+        self.screen_rect = pygame.rect.Rect((0, 0), size)
+
+        self.ui_component = Craps.UIComponent(None, self.screen_rect)
+        self.registry = self.ui_component.registry
+        self.table_manager = Craps.TableManager(self.ui_component, self.screen_rect, "craps_table_correct.png", "craps_table_regions.png")
+        self.bet_manager = Craps.BetManager(self.ui_component, self.screen_rect, rules)
+        self.puck_manager = Craps.PuckManager(self.ui_component, self.screen_rect)
+        self.dice_manager = Craps.DiceManager(self.ui_component, self.screen_rect)
+        self.money_manager = Craps.MoneyManager(self.ui_component, self.screen_rect)
+
+        self.dice_values: "list[int]" = None
+        self.state: TableState = None
+
+    def render(self, roll: int, dice_values: "list[int]", state: TableState, last_win: int) -> pygame.Surface:
+        if self.state is None or state.point != self.state.point:
+            self.puck_manager.set_point(state.point)
+
+        if self.state is None or state.bets != self.state.bets:
+            bets = {bet: amount for bet, amount in state.bets if bet in self.bet_manager.coordinate_mapping}
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.bet_manager.set_bets(bets, state.point)
+
+        if dice_values != self.dice_values:
+            self.dice_manager.create_dice(dice_values)
+
+        self.money_manager.set_money(state.money, sum(amount for bet, amount in state.bets) * 100)
+        self.money_manager.last_win = last_win
+        self.money_manager.create_tooltip()
+
+        self.dice_values = dice_values
+        self.state = state
+        self.registry.compact()
+
+        self.surface.fill((255, 255, 255))
+        self.ui_component.draw(self.surface, self.screen_rect)
+
+        caption = Craps.get_font(int(0.025 * self.size[0])).render("Roll %d: %d + %d" % (roll, dice_values[0], dice_values[1]), True, (0, 0, 0), (255, 255, 255))
+        self.surface.blit(caption, (10, 10))
+
+        return self.surface
+
+def get_renderer(size: "tuple[int, int]", rules: str) -> TableRenderer:
+    if (size, rules) not in renderers:
+        renderers[(size, rules)] = TableRenderer(size, rules)
+
+    return renderers[(size, rules)]
+
+def render_chunk(path: str, directory: str, start: int, stop: int, size: "tuple[int, int]", columns: int = 0, thumbnail_width: int = 320) -> int:
+    frames = read_recording(path)
+    renderer = get_renderer(size, frames[0][1].rules)
+    rendered = 0
+
+    sheet: pygame.Surface = None
+    thumbnail_size = (thumbnail_width, thumbnail_width * size[1] // size[0])
+    if columns:
+        rows = (stop - start + columns - 1) // columns
+        sheet = pygame.Surface((thumbnail_size[0] * columns, thumbnail_size[1] * rows))
+        sheet.fill((255, 255, 255))
+
+    thumbnail: pygame.Surface = None
+    for index in range(start, stop):
+        dice_values, state = frames[index]
+        unchanged = index > 0 and frames[index - 1] == frames[index]
+
+        if not unchanged or (columns and thumbnail is None):
+            last_win = 0
+            if index > 0:
+                last_win = state.get_bankroll() - frames[index - 1][1].get_bankroll()
+
+            surface = renderer.render(index + 1, dice_values, state, last_win)
+            rendered += 1
+
+            if columns:
+                thumbnail = pygame.transform.smoothscale(surface, thumbnail_size)
+            else:
+                pygame.image.save(surface, os.path.join(directory, "frame_%06d.png" % (index + 1)))
+
+        if columns:
+            position = index - start
+            sheet.blit(thumbnail, ((position % columns) * thumbnail_size[0], (position // columns) * thumbnail_size[1]))
+
+    if columns:
+        pygame.image.save(sheet, os.path.join(directory, "sheet_%06d.png" % (start + 1)))
+
+    return rendered
+
+def render_recording(path: str, directory: str, size: "tuple[int, int]" = (1280, 640), workers: int = 1, chunk_size: int = 250, columns: int = 0, rows: int = 0) -> int:
+    os.makedirs(directory, exist_ok=True)
+    count = len(read_recording(path))
+
+    if columns:
+        chunk_size = columns * rows
+
+    chunks = [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+    rendered = 0
+
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=lower_worker_priority) as executor:
+            futures = [executor.submit(render_chunk, path, directory, start, stop, size, columns) for start, stop in chunks]
+            for future in concurrent.futures.as_completed(futures):
+                rendered += future.result()
+    else:
+        for start, stop in chunks:
+            rendered += render_chunk(path, directory, start, stop, size, columns)
+
+    return rendered
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Record a craps session and render it offscreen to PNG frames or contact sheets.")
+    parser.add_argument("--recording", default="session.recording", help="Recording to render; created first if --bet is given")
+    parser.add_argument("--bet", action="append", default=[], help='Bet and amount in dollars for a new recording, e.g. "Pass Line=5"')
+    parser.add_argument("--rolls", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rules", default="standard")
+    parser.add_argument("--money", type=int, default=10000, help="Starting bankroll in cents")
+    parser.add_argument("--output", default="frames")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--sheet", help="Contact sheet grid, e.g. 5x4")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    if args.bet:
+        write_recording(args.recording, record_session(Strategy(parse_bets(args.bet)), args.rolls, args.seed, args.rules, args.money))
+
+    columns, rows = 0, 0
+    if args.sheet:
+        columns, rows = (int(value) for value in args.sheet.lower().split("x"))
+
+    start = time.perf_counter()
+    rendered = render_recording(args.recording, args.output, (args.width, args.width // 2), args.workers, columns=columns, rows=rows)
+    print("Rendered %d frames to %s in %.1fs" % (rendered, args.output, time.perf_counter() - start))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+import json
+import os
+from fractions import Fraction
+
+WIN = "WIN"
+LOSE = "LOSE"
+
+POINTS = (4, 5, 6, 8, 9, 10)
+STATES = (0,) + POINTS
+STATE_INDEX = {state: index for index, state in enumerate(STATES)}
+
+TRUE_ODDS: "dict[int, tuple[int, int]]" = {
+    4: (2, 1),
+    5: (3, 2),
+    6: (6, 5),
+    8: (6, 5),
+    9: (3, 2),
+    10: (2, 1)}
+
+ODDS_BETS: "dict[str, str]" = {
+    "Pass Odds": "Pass Line",
+    "Don't Pass Odds": "Don't Pass"}
+
+BUY_BETS: "dict[str, int]" = {"Buy %d" % point: point for point in POINTS}
+LAY_BETS: "dict[str, int]" = {"Lay %d" % point: point for point in POINTS}
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.json")
+
+BETS = [
+    "Pass Line",
+    "Don't Pass",
+    "Big 6",
+    "Big 8",
+    "Field",
+    "Come",
+    "Don't Come",
+    "Place 4",
+    "Place 5",
+    "Place 6",
+    "Place 8",
+    "Place 9",
+    "Place 10",
+    "Any 7",
+    "Hard 6",
+    "Hard 10",
+    "Hard 8",
+    "Hard 4",
+    "Three",
+    "Two",
+    "Twelve",
+    "Eleven",
+    "Any Craps"]
+
+def next_point(current_point: int, dice_total: int) -> int:
+    if dice_total in POINTS:
+        if current_point == 0:
+            return dice_total
+
+        elif current_point == dice_total:
+            return 0
+
+    elif dice_total == 7 and current_point != 0:
+        return 0
+
+    return current_point
+
+class RuleProfile:
+    def __init__(self, name: str, field_two: int = 2, field_twelve: int = 2, dont_pass_bar: int = 12, odds: "dict[int, int]" = None, buy_vig: int = None, lay_vig: int = None) -> None:
+        self.name = name
+        self.field_two = field_two
+        self.field_twelve = field_twelve
+        self.dont_pass_bar = dont_pass_bar
+        self.odds: "dict[int, int]" = odds or {}
+        self.buy_vig = buy_vig
+        self.lay_vig = lay_vig
+
+        if self.dont_pass_bar not in (2, 12):
+            raise RuntimeError("Invalid Don't Pass bar number: %d" % self.dont_pass_bar)
+
+    @staticmethod
+    def from_config(name: str, config: dict) -> "RuleProfile":
+        odds = config.get("odds", {})
+        if isinstance(odds, int):
+            odds = {point: odds for point in POINTS}
+        elif isinstance(odds, list):
+            odds = {4: odds[0], 5: odds[1], 6: odds[2], 8: odds[2], 9: odds[1], 10: odds[0]}
+        else:
+            odds = {int(point): multiple for point, multiple in odds.items()}
+
+        return RuleProfile(name, config.get("field_two", 2), config.get("field_twelve", 2), config.get("dont_pass_bar", 12), odds, config.get("buy_vig"), config.get("lay_vig"))
+
+    def to_config(self) -> dict:
+        return {
+            "field_two": self.field_two,
+            "field_twelve": self.field_twelve,
+            "dont_pass_bar": self.dont_pass_bar,
+            "odds": {str(point): multiple for point, multiple in sorted(self.odds.items())},
+            "buy_vig": self.buy_vig,
+            "lay_vig": self.lay_vig
+        }
+
+    def get_bets(self) -> "list[str]":
+        bets = list(BETS)
+
+        if self.odds:
+            bets.extend(ODDS_BETS)
+
+        if self.buy_vig is not None:
+            bets.extend(BUY_BETS)
+
+        if self.lay_vig is not None:
+            bets.extend(LAY_BETS)
+
+        return bets
+
+    def get_odds_limit(self, current_point: int) -> int:
+        return self.odds.get(current_point, 0)
+
+STANDARD_PROFILE = RuleProfile("standard")
+
+def determine_bet_outcome(bet: str, current_point: int, dice_total: int, dice_values: "list[int]", profile: RuleProfile = STANDARD_PROFILE) -> "tuple[str, int, int]":
+    if bet == "Pass Line":
+        if current_point == 0:
+            if dice_total in (7, 11):
+                return WIN, 1, 1
+            elif dice_total in (2, 3, 12):
+                return LOSE, 0, 1
+        else:
+            if dice_total == current_point:
+                return WIN, 1, 1
+            elif dice_total == 7:
+                return LOSE, 0, 1
+
+    elif bet == "Don't Pass":
+        if current_point == 0:
+            if dice_total in (7, 11):
+                return LOSE, 0, 1
+            elif dice_total in (2, 3, 12) and dice_total != profile.dont_pass_bar:
+                return WIN, 1, 1
+        else:
+            if dice_total == current_point:
+                return LOSE, 0, 1
+            elif dice_total == 7:
+                return WIN, 1, 1
+
+    elif bet == "Big 6":
+        if dice_total == 6:
+            return WIN, 1, 1
+        elif dice_total == 7:
+            return LOSE, 0, 1
+
+    elif bet == "Big 8":
+        if dice_total == 8:
+            return WIN, 1, 1
+        elif dice_total == 7:
+            return LOSE, 0, 1
+
+    elif bet == "Field":
+        if dice_total == 2:
+            return WIN, profile.field_two, 1
+        elif dice_total == 12:
+            return WIN, profile.field_twelve, 1
+        elif dice_total in (3, 4, 9, 10, 11):
+            return WIN, 1, 1
+        else:
+            return LOSE, 0, 1
+
+    elif bet == "Come":
+        if dice_total in (7, 11):
+            return WIN, 1, 1
+        elif dice_total in (2, 3, 12):
+            return LOSE, 0, 1
+
+    elif bet == "Don't Come":
+        if dice_total in (7, 11):
+            return LOSE, 0, 1
+        elif dice_total in (2, 3, 12) and dice_total != profile.dont_pass_bar:
+            return WIN, 1, 1
+
+    elif bet == "Place 4":
+        if dice_total == 4:
+            return WIN, 9, 5
+        elif dice_total == 7 and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet == "Place 5":
+        if dice_total == 5:
+            return WIN, 7, 5
+        elif dice_total == 7 and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet == "Place 6":
+        if dice_total == 6:
+            return WIN, 7, 6
+        elif dice_total == 7 and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet == "Place 8":
+        if dice_total == 8:
+            return WIN, 7, 6
+        elif dice_total == 7 and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet == "Place 9":
+        if dice_total == 9:
+            return WIN, 7, 5
+        elif dice_total == 7 and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet == "Place 10":
+        if dice_total == 10:
+            return WIN, 9, 5
+        elif dice_total == 7 and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet == "Any 7":
+        if dice_total == 7:
+            return WIN, 4, 1
+        else:
+            return LOSE, 0, 1
+
+    elif bet == "Hard 6":
+        if dice_values == [3, 3]:
+            return WIN, 9, 1
+        elif dice_total in (6, 7) and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet == "Hard 10":
+        if dice_values == [5, 5]:
+            return WIN, 7, 1
+        elif dice_total in (10, 7) and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet == "Hard 8":
+        if dice_values == [4, 4]:
+            return WIN, 9, 1
+        elif dice_total in (8, 7) and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet == "Hard 4":
+        if dice_values == [2, 2]:
+            return WIN, 7, 1
+        elif dice_total in (4, 7) and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet == "Three":
+        if dice_total == 3:
+            return WIN, 15, 1
+        else:
+            return LOSE, 0, 1
+
+    elif bet == "Two":
+        if dice_total == 2:
+            return WIN, 30, 1
+        else:
+            return LOSE, 0, 1
+
+    elif bet == "Twelve":
+        if dice_total == 12:
+            return WIN, 30, 1
+        else:
+            return LOSE, 0, 1
+
+    elif bet == "Eleven":
+        if dice_total == 11:
+            return WIN, 15, 1
+        else:
+            return LOSE, 0, 1
+
+    elif bet == "Any Craps":
+        if dice_total in (2, 3, 12):
+            return WIN, 7, 1
+        else:
+            return LOSE, 0, 1
+
+    elif bet == "Pass Odds":
+        if current_point != 0:
+            if dice_total == current_point:
+                win, to = TRUE_ODDS[current_point]
+                return WIN, win, to
+            elif dice_total == 7:
+                return LOSE, 0, 1
+
+    elif bet == "Don't Pass Odds":
+        if current_point != 0:
+            if dice_total == 7:
+                to, win = TRUE_ODDS[current_point]
+                return WIN, win, to
+            elif dice_total == current_point:
+                return LOSE, 0, 1
+
+    elif bet in BUY_BETS:
+        if dice_total == BUY_BETS[bet]:
+            payout = Fraction(*TRUE_ODDS[dice_total]) - Fraction(profile.buy_vig, 100)
+            return WIN, payout.numerator, payout.denominator
+        elif dice_total == 7 and current_point != 0:
+            return LOSE, 0, 1
+
+    elif bet in LAY_BETS:
+        if dice_total == 7 and current_point != 0:
+            win, to = TRUE_ODDS[LAY_BETS[bet]]
+            payout = Fraction(to, win) * (1 - Fraction(profile.lay_vig, 100))
+            return WIN, payout.numerator, payout.denominator
+        elif dice_total == LAY_BETS[bet]:
+            return LOSE, 0, 1
+
+    else:
+        raise RuntimeError("Invalid bet: %s" % bet)
+
+    return "", 0, 1
+
+class BetOdds:
+    def __init__(self, bet: str, current_point: int, win_probability: Fraction, lose_probability: Fraction, expected_value: Fraction, roll_expected_value: Fraction) -> None:
+        self.bet = bet
+        self.current_point = current_point
+        self.win_probability = win_probability
+        self.lose_probability = lose_probability
+        self.expected_value = expected_value
+        self.roll_expected_value = roll_expected_value
+
+        if win_probability:
+            self.payout = (expected_value + lose_probability) / win_probability
+        else:
+            self.payout = Fraction(0)
+
+    def get_house_edge(self) -> Fraction:
+        return -self.expected_value
+
+def get_dice_outcomes() -> "list[list[int]]":
+    return [[first, second] for first in range(1, 7) for second in range(1, 7)]
+
+def solve_linear_system(matrix: "list[list[Fraction]]", vector: "list[Fraction]") -> "list[Fraction]":
+    size = len(vector)
+    rows = [matrix[index][:] + [vector[index]] for index in range(size)]
+
+    for column in range(size):
+        pivot = next(index for index in range(column, size) if rows[index][column] != 0)
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+
+        for index in range(size):
+            if index != column and rows[index][column] != 0:
+                factor = rows[index][column] / rows[column][column]
+                rows[index] = [value - factor * pivot_value for value, pivot_value in zip(rows[index], rows[column])]
+
+    return [rows[index][size] / rows[index][index] for index in range(size)]
+
+class SettlementTable:
+    def __init__(self, profile: RuleProfile) -> None:
+        self.profile = profile
+        self.bets = profile.get_bets()
+        self.outcomes: "dict[str, list[tuple[str, int, int]]]" = {}
+
+        for bet in self.bets:
+            entries: "list[tuple[str, int, int]]" = []
+
+            for state in STATES:
+                for dice_values in get_dice_outcomes():
+                    entries.append(determine_bet_outcome(bet, state, sum(dice_values), dice_values, profile))
+
+            self.outcomes[bet] = entries
+
+    def settle(self, bet: str, current_point: int, dice_values: "list[int]") -> "tuple[str, int, int]":
+        if bet not in self.outcomes:
+            raise RuntimeError("Invalid bet for %s rules: %s" % (self.profile.name, bet))
+
+        return self.outcomes[bet][STATE_INDEX[current_point] * 36 + dice_values[0] * 6 + dice_values[1] - 7]
+
+def load_rule_profiles(path: str = RULES_PATH) -> "dict[str, RuleProfile]":
+    profiles = {STANDARD_PROFILE.name: STANDARD_PROFILE}
+
+    if os.path.exists(path):
+        with open(path, "r") as file:
+            config = json.load(file)
+
+        for name, profile_config in config.items():
+            profiles[name] = RuleProfile.from_config(name, profile_config)
+
+    return profiles
+
+rule_profiles: "dict[str, RuleProfile]" = {}
+settlement_tables: "dict[str, SettlementTable]" = {}
+
+def get_settlement_table(rules: str = "standard") -> SettlementTable:
+    if rules not in settlement_tables:
+        if not rule_profiles:
+            rule_profiles.update(load_rule_profiles())
+
+        if rules not in rule_profiles:
+            raise RuntimeError("Invalid rules: %s" % rules)
+
+        settlement_tables[rules] = SettlementTable(rule_profiles[rules])
+
+    return settlement_tables[rules]
+
+def build_odds_table(settlement_table: SettlementTable) -> "dict[tuple[str, int], BetOdds]":
+    outcomes = get_dice_outcomes()
+    probability = Fraction(1, len(outcomes))
+
+    table: "dict[tuple[str, int], BetOdds]" = {}
+
+    for bet in settlement_table.bets:
+        transitions = [[Fraction(0)] * len(STATES) for state in STATES]
+        win_vector = [Fraction(0)] * len(STATES)
+        lose_vector = [Fraction(0)] * len(STATES)
+        value_vector = [Fraction(0)] * len(STATES)
+
+        for state in STATES:
+            row = STATE_INDEX[state]
+            transitions[row][row] += 1
+
+            for dice_values in outcomes:
+                dice_total = sum(dice_values)
+                outcome, win, to = settlement_table.settle(bet, state, dice_values)
+
+                if outcome == WIN:
+                    win_vector[row] += probability
+                    value_vector[row] += probability * Fraction(win, to)
+
+                elif outcome == LOSE:
+                    lose_vector[row] += probability
+                    value_vector[row] -= probability
+
+                else:
+                    transitions[row][STATE_INDEX[next_point(state, dice_total)]] -= probability
+
+        roll_values = value_vector[:]
+        win_probabilities = solve_linear_system(transitions, win_vector)
+        lose_probabilities = solve_linear_system(transitions, lose_vector)
+        expected_values = solve_linear_system(transitions, value_vector)
+
+        for state in STATES:
+            row = STATE_INDEX[state]
+            table[(bet, state)] = BetOdds(bet, state, win_probabilities[row], lose_probabilities[row], expected_values[row], roll_values[row])
+
+    return table
+
+odds_tables: "dict[str, dict[tuple[str, int], BetOdds]]" = {}
+
+def get_odds_table(rules: str = "standard") -> "dict[tuple[str, int], BetOdds]":
+    if rules not in odds_tables:
+        odds_tables[rules] = build_odds_table(get_settlement_table(rules))
+
+    return odds_tables[rules]
+
+def get_bet_odds(bet: str, current_point: int, rules: str = "standard") -> BetOdds:
+    odds_table = get_odds_table(rules)
+
+    if (bet, current_point) not in odds_table:
+        raise RuntimeError("Invalid bet for %s rules: %s" % (rules, bet))
+
+    return odds_table[(bet, current_point)]
@@ -0,0 +1,163 @@
+import argparse
+import random
+import statistics
+
+from CrapsSimulation import Simulation, Strategy, parse_bets, roll_dice
+
+METRIC_EV_PER_ROLL = "ev_per_roll"
+METRIC_BANKROLL = "bankroll"
+
+STOP_PRECISION = "precision"
+STOP_DECISION = "decision"
+STOP_BUDGET = "budget"
+
+class RunningStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def get_variance(self) -> float:
+        if self.count < 2:
+            return float("inf")
+
+        return self.m2 / (self.count - 1)
+
+    def get_half_width(self, z: float) -> float:
+        return z * (self.get_variance() / self.count) ** 0.5
+
+class SequentialResult:
+    def __init__(self, metric: str, stats: RunningStats, z: float, rolls: int, stop_reason: str) -> None:
+        self.metric = metric
+        self.mean = stats.mean
+        self.half_width = stats.get_half_width(z)
+        self.samples = stats.count
+        self.rolls = rolls
+        self.stop_reason = stop_reason
+
+    def to_dict(self) -> dict:
+        return {
+            "metric": self.metric,
+            "mean": self.mean,
+            "half_width": self.half_width,
+            "samples": self.samples,
+            "rolls": self.rolls,
+            "stop_reason": self.stop_reason
+        }
+
+def get_z(confidence: float, look: int) -> float:
+    alpha = (1 - confidence) / (look * (look + 1))
+    return statistics.NormalDist().inv_cdf(1 - alpha / 2)
+
+def get_session_money(strategy: Strategy, metric: str, rolls: int, money: int) -> int:
+    if metric == METRIC_EV_PER_ROLL:
+        return max(money, rolls * sum(strategy.bets.values()) * 100 * 2)
+
+    return money
+
+def get_sample(strategy: Strategy, metric: str, dice_sequence: "list[list[int]]", money: int, rules: str = "standard") -> "tuple[float, int]":
+    if metric == METRIC_EV_PER_ROLL:
+        strategy = Strategy(strategy.bets)
+
+    result = Simulation(strategy, rules, money).run_sequence(dice_sequence)
+    delta = (result.money - result.start_money) / 100
+
+    if metric == METRIC_EV_PER_ROLL:
+        return delta / max(result.rolls, 1), result.rolls
+
+    elif metric == METRIC_BANKROLL:
+        return delta, result.rolls
+
+    else:
+        raise RuntimeError("Invalid metric: %s" % metric)
+
+def estimate(strategy: Strategy, metric: str = METRIC_EV_PER_ROLL, precision: float = 0.01, confidence: float = 0.95, rolls: int = 1000, chunk: int = 20, min_samples: int = 30, max_rolls: int = 10000000, seed: int = 0, money: int = 10000, rules: str = "standard") -> SequentialResult:
+    rng = random.Random(seed)
+    stats = RunningStats()
+    money = get_session_money(strategy, metric, rolls, money)
+    rolls_used = 0
+    look = 0
+    z = get_z(confidence, 1)
+
+    while True:
+        for sample in range(chunk):
+            value, session_rolls = get_sample(strategy, metric, [roll_dice(rng) for roll in range(rolls)], money, rules)
+            stats.add(value)
+            rolls_used += session_rolls
+
+        if stats.count >= min_samples:
+            look += 1
+            z = get_z(confidence, look)
+
+            if stats.get_half_width(z) <= precision:
+                return SequentialResult(metric, stats, z, rolls_used, STOP_PRECISION)
+
+        if rolls_used >= max_rolls:
+            return SequentialResult(metric, stats, z, rolls_used, STOP_BUDGET)
+
+def compare(first: Strategy, second: Strategy, metric: str = METRIC_EV_PER_ROLL, precision: float = 0.01, confidence: float = 0.95, rolls: int = 1000, chunk: int = 20, min_samples: int = 30, max_rolls: int = 10000000, seed: int = 0, money: int = 10000, rules: str = "standard") -> SequentialResult:
+    rng = random.Random(seed)
+    stats = RunningStats()
+    first_money = get_session_money(first, metric, rolls, money)
+    second_money = get_session_money(second, metric, rolls, money)
+    rolls_used = 0
+    look = 0
+    z = get_z(confidence, 1)
+
+    while True:
+        for sample in range(chunk):
+            dice_sequence = [roll_dice(rng) for roll in range(rolls)]
+            first_value, first_rolls = get_sample(first, metric, dice_sequence, first_money, rules)
+            second_value, second_rolls = get_sample(second, metric, dice_sequence, second_money, rules)
+
+            stats.add(second_value - first_value)
+            rolls_used += first_rolls + second_rolls
+
+        if stats.count >= min_samples:
+            look += 1
+            z = get_z(confidence, look)
+            half_width = stats.get_half_width(z)
+
+            if abs(stats.mean) > half_width:
+                return SequentialResult(metric, stats, z, rolls_used, STOP_DECISION)
+
+            if half_width <= precision:
+                return SequentialResult(metric, stats, z, rolls_used, STOP_PRECISION)
+
+        if rolls_used >= max_rolls:
+            return SequentialResult(metric, stats, z, rolls_used, STOP_BUDGET)
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate craps strategies until a confidence interval is tight enough.")
+    parser.add_argument("--strategy", action="append", default=[], help='Comma separated bets, e.g. "Pass Line=5,Place 6=6"; give two to compare')
+    parser.add_argument("--metric", choices=[METRIC_EV_PER_ROLL, METRIC_BANKROLL], default=METRIC_EV_PER_ROLL)
+    parser.add_argument("--precision", type=float, default=0.01, help="Target confidence interval half width in dollars")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--rolls", type=int, default=1000, help="Rolls per session")
+    parser.add_argument("--chunk", type=int, default=20, help="Sessions between confidence checks")
+    parser.add_argument("--max-rolls", type=int, default=10000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--money", type=int, default=10000, help="Starting bankroll in cents")
+    parser.add_argument("--rules", default="standard")
+    args = parser.parse_args(argv)
+
+    strategies = [Strategy(parse_bets(value.split(","))) for value in args.strategy or ["Pass Line=5"]]
+    options = (args.metric, args.precision, args.confidence, args.rolls, args.chunk, 30, args.max_rolls, args.seed, args.money, args.rules)
+
+    if len(strategies) == 1:
+        result = estimate(strategies[0], *options)
+    elif len(strategies) == 2:
+        result = compare(strategies[0], strategies[1], *options)
+    else:
+        raise RuntimeError("Give one strategy to estimate or two to compare")
+
+    print("%s: %.4f +/- %.4f (%s after %d samples, %d rolls)" % (result.metric, result.mean, result.half_width, result.stop_reason, result.samples, result.rolls))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import argparse
+import concurrent.futures
+import os
+import random
+import time
+from multiprocessing import shared_memory
+
+import numpy
+
+from CrapsRules import WIN, LOSE
+from CrapsSimulation import Simulation, Strategy, lower_worker_priority, parse_bets, roll_dice
+from CrapsState import TableState
+from CrapsStore import ColumnStore, format_strategy, make_session_columns
+
+OUTCOMES = (WIN, LOSE, "")
+OUTCOME_NAMES = ("win", "lose", "no decision")
+
+class SharedResults:
+    def __init__(self, sessions: int, rolls: int, bets: "list[str]", chunk_size: int = 50, name: str = None) -> None:
+        self.sessions = sessions
+        self.rolls = rolls
+        self.bets = list(bets)
+        self.chunk_size = chunk_size
+        self.chunks = (sessions + chunk_size - 1) // chunk_size
+        self.owner = name is None
+
+        layout = [
+            ("trajectories", numpy.int64, (sessions, rolls + 1)),
+            ("outcome_counts", numpy.int64, (self.chunks, len(self.bets), len(OUTCOMES))),
+            ("completed", numpy.uint8, (self.chunks,))]
+
+        size = sum(numpy.dtype(dtype).itemsize * int(numpy.prod(shape)) for field, dtype, shape in layout)
+
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        else:
+            self.memory = shared_memory.SharedMemory(name)
+
+        offset = 0
+        for field, dtype, shape in layout:
+            array = numpy.ndarray(shape, dtype, self.memory.buf, offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+
+        if self.owner:
+            self.trajectories.fill(0)
+            self.outcome_counts.fill(0)
+            self.completed.fill(0)
+
+    def get_spec(self) -> tuple:
+        return (self.sessions, self.rolls, self.bets, self.chunk_size, self.memory.name)
+
+    @staticmethod
+    def attach(spec: tuple) -> "SharedResults":
+        return SharedResults(*spec)
+
+    def get_chunk_slice(self, chunk: int) -> slice:
+        return slice(chunk * self.chunk_size, min((chunk + 1) * self.chunk_size, self.sessions))
+
+    def get_completed_slices(self) -> "list[slice]":
+        slices: "list[slice]" = []
+        start = None
+
+        for chunk in range(self.chunks + 1):
+            if chunk < self.chunks and self.completed[chunk]:
+                if start is None:
+                    start = chunk
+            elif start is not None:
+                slices.append(slice(start * self.chunk_size, min(chunk * self.chunk_size, self.sessions)))
+                start = None
+
+        return slices
+
+    def get_completed_count(self) -> int:
+        return sum(part.stop - part.start for part in self.get_completed_slices())
+
+    def get_final_bankrolls(self) -> numpy.ndarray:
+        slices = self.get_completed_slices()
+        if len(slices) == 1:
+            return self.trajectories[slices[0], -1]
+
+        return numpy.concatenate([self.trajectories[part, -1] for part in slices] or [numpy.zeros(0, numpy.int64)])
+
+    def get_mean_trajectory(self) -> numpy.ndarray:
+        total = numpy.zeros(self.rolls + 1)
+        count = 0
+
+        for part in self.get_completed_slices():
+            total += self.trajectories[part].sum(axis=0)
+            count += part.stop - part.start
+
+        return total / max(count, 1)
+
+    def get_outcome_counts(self) -> "dict[str, dict[str, int]]":
+        totals = numpy.zeros((len(self.bets), len(OUTCOMES)), numpy.int64)
+        for chunk in numpy.flatnonzero(self.completed):
+            totals += self.outcome_counts[chunk]
+
+        return {bet: dict(zip(OUTCOME_NAMES, (int(count) for count in totals[index]))) for index, bet in enumerate(self.bets)}
+
+    def close(self) -> None:
+        for field in ("trajectories", "outcome_counts", "completed"):
+            setattr(self, field, None)
+
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+def store_results(results: SharedResults, store: ColumnStore, bets: "dict[str, int]", current_point: int, rules: str, seed: int = 0) -> int:
+    slices = results.get_completed_slices()
+    columns: "dict[str, list[numpy.ndarray]]" = {"seed": [], "start_money": [], "money": [], "min_money": [], "max_money": []}
+
+    for part in slices:
+        trajectories = results.trajectories[part]
+        columns["seed"].append(numpy.arange(seed + part.start, seed + part.stop))
+        columns["start_money"].append(trajectories[:, 0])
+        columns["money"].append(trajectories[:, -1])
+        columns["min_money"].append(trajectories.min(axis=1))
+        columns["max_money"].append(trajectories.max(axis=1))
+
+    sessions = results.get_completed_count()
+    session_columns = {column: numpy.concatenate(arrays) if arrays else numpy.zeros(0, numpy.int64) for column, arrays in columns.items()}
+
+    return store.append(make_session_columns(sessions, dict(session_columns, source="shared", strategy=format_strategy(bets), rules=rules, start_point=current_point)))
+
+def run_chunk(spec: tuple, chunk: int, bets: "dict[str, int]", current_point: int, money: int, seed: int, rules: str = "standard") -> int:
+    results = SharedResults.attach(spec)
+
+    try:
+        sessions = results.get_chunk_slice(chunk)
+        trajectories = results.trajectories[sessions]
+        outcome_counts = results.outcome_counts[chunk]
+        bet_index = {bet: index for index, bet in enumerate(results.bets)}
+        outcome_index = {outcome: index for index, outcome in enumerate(OUTCOMES)}
+        outcomes: "dict[str, str]" = {}
+
+        for row in range(len(trajectories)):
+            rng = random.Random(seed + sessions.start + row)
+            simulation = Simulation(Strategy(bets), rules, money)
+            simulation.set_state(TableState(current_point, money, bets, rules))
+            trajectory = trajectories[row]
+            trajectory[0] = simulation.get_bankroll()
+
+            for roll in range(1, results.rolls + 1):
+                simulation.place_bets()
+                if not simulation.bets:
+                    trajectory[roll:] = simulation.get_bankroll()
+                    break
+
+                dice_values = roll_dice(rng)
+                outcomes.clear()
+                simulation.roll(dice_values, outcomes)
+
+                for bet, outcome in outcomes.items():
+                    outcome_counts[bet_index[bet], outcome_index[outcome]] += 1
+
+                trajectory[roll] = simulation.get_bankroll()
+
+        results.completed[chunk] = 1
+        return chunk
+    finally:
+        results.close()
+
+def submit_chunks(executor: concurrent.futures.Executor, results: SharedResults, bets: "dict[str, int]", current_point: int = 0, money: int = 10000, seed: int = 0, rules: str = "standard") -> "list[concurrent.futures.Future]":
+    return [executor.submit(run_chunk, results.get_spec(), chunk, bets, current_point, money, seed, rules) for chunk in range(results.chunks)]
+
+def run_shared(bets: "dict[str, int]", current_point: int = 0, money: int = 10000, rolls: int = 500, sessions: int = 2000, seed: int = 0, rules: str = "standard", workers: int = 1, chunk_size: int = 50) -> SharedResults:
+    results = SharedResults(sessions, rolls, sorted(bets), chunk_size)
+
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=lower_worker_priority) as executor:
+        futures = submit_chunks(executor, results, bets, current_point, money, seed, rules)
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+    return results
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate craps sessions into a shared-memory result buffer.")
+    parser.add_argument("--bet", action="append", default=[], help='Bet and amount in dollars, e.g. "Pass Line=5"')
+    parser.add_argument("--money", type=int, default=10000, help="Starting bankroll in cents")
+    parser.add_argument("--point", type=int, default=0, help="Puck point at the start of each session")
+    parser.add_argument("--rolls", type=int, default=500)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rules", default="standard")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--store", help="Append final bankrolls to a columnar store directory")
+    args = parser.parse_args(argv)
+
+    bets = parse_bets(args.bet or ["Pass Line=5"])
+    start = time.perf_counter()
+    results = run_shared(bets, args.point, args.money, args.rolls, args.sessions, args.seed, args.rules, args.workers)
+
+    try:
+        final_bankrolls = results.get_final_bankrolls()
+        print("Sessions: %d in %.2fs" % (len(final_bankrolls), time.perf_counter() - start))
+        print("Mean Final Bankroll: $%.2f" % (final_bankrolls.mean() / 100))
+        print("Mean Bankroll Halfway: $%.2f" % (results.get_mean_trajectory()[args.rolls // 2] / 100))
+
+        for bet, counts in results.get_outcome_counts().items():
+            print("%s: %s" % (bet, ", ".join("%s %d" % item for item in counts.items())))
+
+        if args.store:
+            store_results(results, ColumnStore(args.store), bets, args.point, args.rules, args.seed)
+    finally:
+        results.close()
+
+if __name__ == "__main__":
+    main()
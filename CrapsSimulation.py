@@ -0,0 +1,231 @@
+import os
+import random
+from multiprocessing import shared_memory
+from typing import Iterable
+
+from CrapsRules import WIN, LOSE, ODDS_BETS, get_settlement_table, next_point
+from CrapsState import TableState
+
+LINE_BETS = ("Pass Line", "Don't Pass")
+
+STOP_ROLLS = "rolls"
+STOP_LOSS = "stop_loss"
+STOP_WIN = "stop_win"
+STOP_BUST = "bust"
+
+cancel_tokens: "dict[str, CancelToken]" = {}
+
+class Strategy:
+    def __init__(self, bets: "dict[str, int]", stop_loss: int = 0, stop_win: int = 0) -> None:
+        self.bets = dict(bets)
+        self.stop_loss = stop_loss
+        self.stop_win = stop_win
+
+    def to_config(self) -> dict:
+        return {
+            "bets": dict(sorted(self.bets.items())),
+            "stop_loss": self.stop_loss,
+            "stop_win": self.stop_win
+        }
+
+    @staticmethod
+    def from_config(config: dict) -> "Strategy":
+        return Strategy(config["bets"], config.get("stop_loss", 0), config.get("stop_win", 0))
+
+class SessionResult:
+    def __init__(self, start_money: int) -> None:
+        self.start_money = start_money
+        self.money = start_money
+        self.min_money = start_money
+        self.max_money = start_money
+        self.rolls = 0
+        self.wagered = 0
+        self.stop_reason = STOP_ROLLS
+
+    def to_dict(self) -> dict:
+        return {
+            "start_money": self.start_money,
+            "money": self.money,
+            "min_money": self.min_money,
+            "max_money": self.max_money,
+            "rolls": self.rolls,
+            "wagered": self.wagered,
+            "stop_reason": self.stop_reason
+        }
+
+class Simulation:
+    def __init__(self, strategy: Strategy, rules: str = "standard", money: int = 10000) -> None:
+        self.strategy = strategy
+        self.rules = rules
+        self.settlement_table = get_settlement_table(rules)
+        self.money = money
+        self.bets: "dict[str, int]" = {}
+        self.current_point = 0
+
+    def place_bets(self) -> int:
+        wagered = 0
+
+        for bet, amount in self.strategy.bets.items():
+            if bet in self.bets:
+                continue
+
+            if bet in LINE_BETS and self.current_point != 0:
+                continue
+
+            if bet in ODDS_BETS:
+                if self.current_point == 0 or ODDS_BETS[bet] not in self.bets:
+                    continue
+
+                amount = min(amount, self.settlement_table.profile.get_odds_limit(self.current_point) * self.bets[ODDS_BETS[bet]])
+                if amount <= 0:
+                    continue
+
+            if self.money < amount * 100:
+                continue
+
+            self.bets[bet] = amount
+            self.money -= amount * 100
+            wagered += amount * 100
+
+        return wagered
+
+    def roll(self, dice_values: "list[int]", outcomes: "dict[str, str]" = None) -> None:
+        dice_total = sum(dice_values)
+
+        for bet, amount in list(self.bets.items()):
+            outcome, win, to = self.settlement_table.settle(bet, self.current_point, dice_values)
+            if outcomes is not None:
+                outcomes[bet] = outcome
+
+            if outcome == WIN:
+                self.money += amount * 100 * win // to
+
+                if bet in ODDS_BETS:
+                    self.money += amount * 100
+                    del self.bets[bet]
+
+            elif outcome == LOSE:
+                del self.bets[bet]
+
+        self.current_point = next_point(self.current_point, dice_total)
+
+    def get_bankroll(self) -> int:
+        return self.money + sum(self.bets.values()) * 100
+
+    def get_state(self) -> TableState:
+        return TableState(self.current_point, self.money, self.bets, self.rules)
+
+    def set_state(self, state: TableState) -> None:
+        if state.rules != self.rules:
+            raise RuntimeError("State rules %s do not match simulation rules %s" % (state.rules, self.rules))
+
+        self.current_point = state.point
+        self.money = state.money
+        self.bets = state.get_bets()
+
+    def run(self, rng: random.Random, rolls: int) -> SessionResult:
+        return self.run_sequence(roll_dice(rng) for roll in range(rolls))
+
+    def run_sequence(self, dice_sequence: "Iterable[list[int]]") -> SessionResult:
+        result = SessionResult(self.get_bankroll())
+        stop_loss = result.start_money - self.strategy.stop_loss * 100
+        stop_win = result.start_money + self.strategy.stop_win * 100
+
+        for dice_values in dice_sequence:
+            result.wagered += self.place_bets()
+
+            if not self.bets:
+                result.stop_reason = STOP_BUST
+                break
+
+            self.roll(dice_values)
+            result.rolls += 1
+
+            bankroll = self.get_bankroll()
+            result.min_money = min(result.min_money, bankroll)
+            result.max_money = max(result.max_money, bankroll)
+
+            if self.strategy.stop_loss and bankroll <= stop_loss:
+                result.stop_reason = STOP_LOSS
+                break
+
+            if self.strategy.stop_win and bankroll >= stop_win:
+                result.stop_reason = STOP_WIN
+                break
+
+        result.money = self.get_bankroll()
+        return result
+
+def roll_dice(rng: random.Random) -> "list[int]":
+    return [rng.randint(1, 6), rng.randint(1, 6)]
+
+def simulate(config: dict, seed: int, rolls: int, rules: str = "standard", money: int = 10000) -> SessionResult:
+    simulation = Simulation(Strategy.from_config(config), rules, money)
+    return simulation.run(random.Random(seed), rolls)
+
+def lower_worker_priority() -> None:
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+class CancelToken:
+    def __init__(self, name: str = None) -> None:
+        self.owner = name is None
+
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=8)
+            self.memory.buf[:8] = bytes(8)
+        else:
+            self.memory = shared_memory.SharedMemory(name)
+
+    def get_generation(self) -> int:
+        return int.from_bytes(self.memory.buf[:8], "little")
+
+    def cancel(self) -> int:
+        generation = self.get_generation() + 1
+        self.memory.buf[:8] = generation.to_bytes(8, "little")
+        return generation
+
+    def get_spec(self) -> "tuple[str, int]":
+        return (self.memory.name, self.get_generation())
+
+    def close(self) -> None:
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+def is_cancelled(cancel: "tuple[str, int]") -> bool:
+    if cancel is None:
+        return False
+
+    name, generation = cancel
+    if name not in cancel_tokens:
+        cancel_tokens[name] = CancelToken(name)
+
+    return cancel_tokens[name].get_generation() != generation
+
+def run_sessions(bets: "dict[str, int]", current_point: int, money: int, rolls: int, seed: int, sessions: int, rules: str = "standard", cancel: "tuple[str, int]" = None) -> "list[int]":
+    results: "list[int]" = []
+
+    for index in range(sessions):
+        if is_cancelled(cancel):
+            return None
+
+        simulation = Simulation(Strategy(bets), rules, money)
+        simulation.set_state(TableState(current_point, money, bets, rules))
+
+        result = simulation.run(random.Random(seed + index), rolls)
+        results.append(result.money)
+
+    return results
+
+def parse_bets(values: "list[str]") -> "dict[str, int]":
+    bets: "dict[str, int]" = {}
+
+    for value in values:
+        bet, separator, amount = value.rpartition("=")
+        if not separator:
+            raise RuntimeError("Invalid bet: %s" % value)
+
+        bets[bet] = int(amount)
+
+    return bets
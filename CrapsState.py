@@ -0,0 +1,202 @@
+import os
+import random
+import struct
+
+from CrapsRules import WIN, LOSE, BETS, BUY_BETS, LAY_BETS, ODDS_BETS, get_dice_outcomes, get_settlement_table, next_point
+
+CHECKPOINT_MAGIC = b"CRPS"
+CHECKPOINT_VERSION = 1
+
+STATE_BETS: "list[str]" = BETS + list(ODDS_BETS) + list(BUY_BETS) + list(LAY_BETS)
+STATE_BET_INDEX: "dict[str, int]" = {bet: index for index, bet in enumerate(STATE_BETS)}
+
+HEADER_FORMAT = struct.Struct("<4sBBqBB")
+BET_FORMAT = struct.Struct("<BI")
+RNG_FORMAT = struct.Struct("<625I")
+GAUSS_FORMAT = struct.Struct("<Bd")
+PROGRESS_FORMAT = struct.Struct("<32sQI")
+
+RNG_NONE = 0
+RNG_NO_GAUSS = 1
+RNG_FULL = 2
+
+class TableState:
+    __slots__ = ("point", "money", "bets", "rules")
+
+    def __init__(self, point: int = 0, money: int = 10000, bets: "dict[str, int]" = None, rules: str = "standard") -> None:
+        object.__setattr__(self, "point", point)
+        object.__setattr__(self, "money", money)
+        object.__setattr__(self, "bets", tuple(sorted((bets or {}).items())))
+        object.__setattr__(self, "rules", rules)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise RuntimeError("TableState is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TableState):
+            return NotImplemented
+
+        return (self.point, self.money, self.bets, self.rules) == (other.point, other.money, other.bets, other.rules)
+
+    def __hash__(self) -> int:
+        return hash((self.point, self.money, self.bets, self.rules))
+
+    def __repr__(self) -> str:
+        return "TableState(point=%d, money=%d, bets=%r, rules=%r)" % (self.point, self.money, dict(self.bets), self.rules)
+
+    def get_bets(self) -> "dict[str, int]":
+        return dict(self.bets)
+
+    def get_bankroll(self) -> int:
+        return self.money + sum(amount for bet, amount in self.bets) * 100
+
+    def fork(self, point: int = None, money: int = None, bets: "dict[str, int]" = None) -> "TableState":
+        state = object.__new__(TableState)
+        object.__setattr__(state, "point", self.point if point is None else point)
+        object.__setattr__(state, "money", self.money if money is None else money)
+        object.__setattr__(state, "bets", self.bets if bets is None else tuple(sorted(bets.items())))
+        object.__setattr__(state, "rules", self.rules)
+        return state
+
+    def place_bet(self, bet: str, amount: int) -> "TableState":
+        if bet not in STATE_BET_INDEX:
+            raise RuntimeError("Invalid bet: %s" % bet)
+
+        bets = self.get_bets()
+        bets[bet] = bets.get(bet, 0) + amount
+        return self.fork(money=self.money - amount * 100, bets=bets)
+
+    def roll(self, dice_values: "list[int]") -> "TableState":
+        settlement_table = get_settlement_table(self.rules)
+        money = self.money
+        bets = self.bets
+        remaining: "list[tuple[str, int]]" = []
+
+        for bet, amount in self.bets:
+            outcome, win, to = settlement_table.settle(bet, self.point, dice_values)
+
+            if outcome == WIN:
+                money += amount * 100 * win // to
+
+                if bet in ODDS_BETS:
+                    money += amount * 100
+                    continue
+
+            elif outcome == LOSE:
+                continue
+
+            remaining.append((bet, amount))
+
+        if len(remaining) != len(bets):
+            bets = tuple(remaining)
+
+        state = self.fork(next_point(self.point, sum(dice_values)), money)
+        object.__setattr__(state, "bets", bets)
+        return state
+
+    def get_branches(self) -> "list[tuple[list[int], TableState]]":
+        return [(dice_values, self.roll(dice_values)) for dice_values in get_dice_outcomes()]
+
+    def get_expected_bankroll(self, rolls: int = 1) -> float:
+        if rolls <= 0:
+            return float(self.get_bankroll())
+
+        return sum(state.get_expected_bankroll(rolls - 1) for dice_values, state in self.get_branches()) / 36
+
+    def to_bytes(self) -> bytes:
+        rules = self.rules.encode("utf-8")
+        parts = [HEADER_FORMAT.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, self.point, self.money, len(rules), len(self.bets)), rules]
+
+        for bet, amount in self.bets:
+            parts.append(BET_FORMAT.pack(STATE_BET_INDEX[bet], amount))
+
+        return b"".join(parts)
+
+    @staticmethod
+    def from_bytes(data: bytes, offset: int = 0) -> "tuple[TableState, int]":
+        magic, version, point, money, rules_length, bet_count = HEADER_FORMAT.unpack_from(data, offset)
+        if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+            raise RuntimeError("Invalid checkpoint")
+
+        offset += HEADER_FORMAT.size
+        rules = data[offset:offset + rules_length].decode("utf-8")
+        offset += rules_length
+
+        bets: "dict[str, int]" = {}
+        for index in range(bet_count):
+            bet_index, amount = BET_FORMAT.unpack_from(data, offset)
+            bets[STATE_BETS[bet_index]] = amount
+            offset += BET_FORMAT.size
+
+        return TableState(point, money, bets, rules), offset
+
+class RunProgress:
+    __slots__ = ("digest", "offset", "completed")
+
+    def __init__(self, digest: bytes, offset: int = 0, completed: "set[int]" = None) -> None:
+        self.digest = digest
+        self.offset = offset
+        self.completed: "set[int]" = set(completed or ())
+
+    def to_bytes(self) -> bytes:
+        completed = sorted(self.completed)
+        return PROGRESS_FORMAT.pack(self.digest, self.offset, len(completed)) + struct.pack("<%dQ" % len(completed), *completed)
+
+    @staticmethod
+    def from_bytes(data: bytes, offset: int = 0) -> "tuple[RunProgress, int]":
+        digest, output_offset, count = PROGRESS_FORMAT.unpack_from(data, offset)
+        offset += PROGRESS_FORMAT.size
+
+        completed = struct.unpack_from("<%dQ" % count, data, offset)
+        offset += 8 * count
+
+        return RunProgress(digest, output_offset, set(completed)), offset
+
+def save_checkpoint(path: str, state: TableState, rng: random.Random = None, rolls: int = 0, progress: RunProgress = None) -> None:
+    parts = [state.to_bytes(), struct.pack("<QB", rolls, RNG_NONE if rng is None else RNG_FULL)]
+
+    if rng is not None:
+        version, internal_state, gauss_next = rng.getstate()
+        parts.append(RNG_FORMAT.pack(*internal_state))
+        parts.append(GAUSS_FORMAT.pack(gauss_next is not None, gauss_next or 0.0))
+
+    if progress is not None:
+        parts.append(progress.to_bytes())
+
+    temp_path = "%s.%d.tmp" % (path, os.getpid())
+    with open(temp_path, "wb") as file:
+        file.write(b"".join(parts))
+    os.replace(temp_path, path)
+
+def read_checkpoint(path: str) -> "tuple[TableState, random.Random, int, RunProgress]":
+    with open(path, "rb") as file:
+        data = file.read()
+
+    state, offset = TableState.from_bytes(data)
+    rolls, rng_format = struct.unpack_from("<QB", data, offset)
+    offset += struct.calcsize("<QB")
+
+    rng = None
+    if rng_format != RNG_NONE:
+        internal_state = RNG_FORMAT.unpack_from(data, offset)
+        offset += RNG_FORMAT.size
+
+        gauss_next = None
+        if rng_format == RNG_FULL:
+            has_gauss, value = GAUSS_FORMAT.unpack_from(data, offset)
+            offset += GAUSS_FORMAT.size
+            if has_gauss:
+                gauss_next = value
+
+        rng = random.Random()
+        rng.setstate((3, internal_state, gauss_next))
+
+    progress = None
+    if offset < len(data):
+        progress, offset = RunProgress.from_bytes(data, offset)
+
+    return state, rng, rolls, progress
+
+def load_checkpoint(path: str) -> "tuple[TableState, random.Random, int]":
+    state, rng, rolls, progress = read_checkpoint(path)
+    return state, rng, rolls
@@ -0,0 +1,274 @@
+import argparse
+import json
+import os
+from typing import Iterable
+
+import numpy
+
+MANIFEST_NAME = "manifest.json"
+BLOCK_ROWS = 1 << 20
+AGGREGATES = ("count", "sum", "mean", "min", "max")
+CATEGORY = "category"
+
+SESSION_SCHEMA: "dict[str, tuple[str, object]]" = {
+    "source": (CATEGORY, ""),
+    "strategy": (CATEGORY, ""),
+    "place": (CATEGORY, ""),
+    "rules": (CATEGORY, ""),
+    "stop_reason": (CATEGORY, ""),
+    "seed": ("<i8", -1),
+    "start_point": ("|i1", 0),
+    "rolls": ("<i8", -1),
+    "base_bet": ("<i8", -1),
+    "stop_loss": ("<i8", 0),
+    "stop_win": ("<i8", 0),
+    "start_money": ("<i8", -1),
+    "money": ("<i8", -1),
+    "min_money": ("<i8", -1),
+    "max_money": ("<i8", -1),
+    "wagered": ("<i8", -1)
+}
+
+def format_strategy(bets: "dict[str, int]") -> str:
+    return ",".join("%s=%d" % item for item in sorted(bets.items()))
+
+def make_session_columns(rows: int, columns: "dict[str, object]") -> "dict[str, object]":
+    unknown = set(columns) - set(SESSION_SCHEMA)
+    if unknown:
+        raise RuntimeError("Columns not in session schema: %s" % ", ".join(sorted(unknown)))
+
+    session_columns: "dict[str, object]" = {}
+    for column, (dtype, default) in SESSION_SCHEMA.items():
+        values = columns.get(column)
+
+        if dtype == CATEGORY:
+            if values is None:
+                values = [default] * rows
+            elif isinstance(values, str):
+                values = [values] * rows
+
+            session_columns[column] = [str(value) for value in values]
+        else:
+            if values is None:
+                values = default
+
+            session_columns[column] = numpy.broadcast_to(numpy.asarray(values, dtype), (rows,)).copy()
+
+    return session_columns
+
+class ColumnStore:
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.manifest = {"rows": 0, "columns": {}, "categories": {}, "segments": []}
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                self.manifest = json.load(file)
+
+    def get_rows(self) -> int:
+        return self.manifest["rows"]
+
+    def get_columns(self) -> "dict[str, str]":
+        return dict(self.manifest["columns"])
+
+    def encode(self, column: str, values: list) -> numpy.ndarray:
+        categories: "list[str]" = self.manifest["categories"].setdefault(column, [])
+        codes = {value: index for index, value in enumerate(categories)}
+
+        for value in values:
+            if value not in codes:
+                codes[value] = len(categories)
+                categories.append(value)
+
+        return numpy.array([codes[value] for value in values], numpy.int32)
+
+    def append(self, columns: "dict[str, list]") -> int:
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) != 1:
+            raise RuntimeError("Columns must have the same length")
+
+        rows = lengths.pop()
+        if rows == 0:
+            return 0
+
+        if self.manifest["columns"] and set(columns) != set(self.manifest["columns"]):
+            raise RuntimeError("Columns do not match store: %s" % ", ".join(sorted(self.manifest["columns"])))
+
+        arrays: "dict[str, numpy.ndarray]" = {}
+        for column, values in columns.items():
+            if isinstance(values, numpy.ndarray) and values.dtype.kind != "U":
+                array = values
+            elif any(isinstance(value, str) for value in values):
+                array = self.encode(column, list(values))
+            else:
+                array = numpy.asarray(values)
+
+            dtype = self.manifest["columns"].setdefault(column, array.dtype.str)
+            if column in self.manifest["categories"] and array.dtype != numpy.int32:
+                raise RuntimeError("Column %s holds categories" % column)
+
+            arrays[column] = array.astype(dtype, copy=False)
+
+        segment = "segment_%06d" % len(self.manifest["segments"])
+        os.makedirs(os.path.join(self.directory, segment), exist_ok=True)
+
+        for column, array in arrays.items():
+            numpy.save(os.path.join(self.directory, segment, column + ".npy"), array)
+
+        self.manifest["segments"].append({"name": segment, "rows": rows})
+        self.manifest["rows"] += rows
+        self.write_manifest()
+
+        return rows
+
+    def write_manifest(self) -> None:
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        temp_path = "%s.%d.tmp" % (path, os.getpid())
+
+        with open(temp_path, "w") as file:
+            json.dump(self.manifest, file, indent=2)
+        os.replace(temp_path, path)
+
+    def load_column(self, segment: str, column: str) -> numpy.ndarray:
+        if column not in self.manifest["columns"]:
+            raise RuntimeError("Invalid column: %s" % column)
+
+        return numpy.load(os.path.join(self.directory, segment, column + ".npy"), mmap_mode="r")
+
+    def get_match(self, column: str, value: object) -> "object":
+        if column not in self.manifest["categories"]:
+            return value
+
+        categories: "list[str]" = self.manifest["categories"][column]
+        if isinstance(value, (list, tuple)):
+            return [categories.index(item) for item in value if item in categories]
+
+        return categories.index(value) if value in categories else -1
+
+    def get_mask(self, arrays: "dict[str, numpy.ndarray]", where: dict, start: int, stop: int) -> numpy.ndarray:
+        mask = numpy.ones(stop - start, bool)
+
+        for column, value in where.items():
+            array = arrays[column][start:stop]
+            match = self.get_match(column, value)
+
+            if isinstance(match, list):
+                mask &= numpy.isin(array, match)
+            elif isinstance(match, tuple):
+                low, high = match
+                if low is not None:
+                    mask &= array >= low
+                if high is not None:
+                    mask &= array < high
+            else:
+                mask &= array == match
+
+        return mask
+
+    def scan(self, columns: "list[str]", where: dict = None) -> "Iterable[dict[str, numpy.ndarray]]":
+        where = where or {}
+
+        for segment in self.manifest["segments"]:
+            arrays = {column: self.load_column(segment["name"], column) for column in set(columns) | set(where)}
+
+            for start in range(0, segment["rows"], BLOCK_ROWS):
+                stop = min(start + BLOCK_ROWS, segment["rows"])
+                mask = self.get_mask(arrays, where, start, stop)
+
+                if mask.any():
+                    yield {column: numpy.asarray(arrays[column][start:stop])[mask] for column in columns}
+
+    def query(self, column: str, aggregate: str = "mean", **where: object) -> float:
+        if aggregate not in AGGREGATES:
+            raise RuntimeError("Invalid aggregate: %s" % aggregate)
+
+        count = 0
+        total = 0.0
+        low = float("inf")
+        high = float("-inf")
+
+        for block in self.scan([column], where):
+            values = block[column]
+            count += len(values)
+            total += float(values.sum(dtype=numpy.float64))
+            low = min(low, float(values.min()))
+            high = max(high, float(values.max()))
+
+        if aggregate == "count":
+            return count
+
+        if count == 0:
+            return float("nan")
+
+        return {"sum": total, "mean": total / count, "min": low, "max": high}[aggregate]
+
+    def group_by(self, group: str, column: str, aggregate: str = "mean", **where: object) -> "dict[object, float]":
+        if aggregate not in AGGREGATES:
+            raise RuntimeError("Invalid aggregate: %s" % aggregate)
+
+        categories = self.manifest["categories"].get(group)
+        totals: "dict[object, list[float]]" = {}
+
+        for block in self.scan([group, column], where):
+            keys, inverse = numpy.unique(block[group], return_inverse=True)
+            values = block[column].astype(numpy.float64)
+            counts = numpy.bincount(inverse, minlength=len(keys))
+            sums = numpy.bincount(inverse, values, len(keys))
+
+            lows = numpy.full(len(keys), numpy.inf)
+            highs = numpy.full(len(keys), -numpy.inf)
+            numpy.minimum.at(lows, inverse, values)
+            numpy.maximum.at(highs, inverse, values)
+
+            for index, key in enumerate(keys.tolist()):
+                total = totals.setdefault(key, [0, 0.0, float("inf"), float("-inf")])
+                total[0] += int(counts[index])
+                total[1] += float(sums[index])
+                total[2] = min(total[2], float(lows[index]))
+                total[3] = max(total[3], float(highs[index]))
+
+        results: "dict[object, float]" = {}
+        for key, (count, total, low, high) in sorted(totals.items()):
+            label = categories[key] if categories is not None else key
+            results[label] = {"count": count, "sum": total, "mean": total / count, "min": low, "max": high}[aggregate]
+
+        return results
+
+def parse_where(values: "list[str]") -> dict:
+    where: dict = {}
+
+    for value in values:
+        column, separator, match = value.partition("=")
+        if not separator:
+            raise RuntimeError("Invalid filter: %s" % value)
+
+        try:
+            where[column] = int(match)
+        except ValueError:
+            where[column] = match
+
+    return where
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Query a columnar store of simulated craps sessions.")
+    parser.add_argument("directory")
+    parser.add_argument("--column", default="money")
+    parser.add_argument("--aggregate", choices=AGGREGATES, default="mean")
+    parser.add_argument("--where", action="append", default=[], help='Column filter, e.g. "start_point=4"')
+    parser.add_argument("--group-by")
+    args = parser.parse_args(argv)
+
+    store = ColumnStore(args.directory)
+    where = parse_where(args.where)
+
+    if args.group_by:
+        for key, value in store.group_by(args.group_by, args.column, args.aggregate, **where).items():
+            print("%s: %s" % (key, value))
+    else:
+        print(store.query(args.column, args.aggregate, **where))
+
+if __name__ == "__main__":
+    main()
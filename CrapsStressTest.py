@@ -0,0 +1,159 @@
+import argparse
+import contextlib
+import io
+import os
+import random
+import resource
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import Craps
+
+SCENARIOS = ["sweep", "clicks", "rolls", "mixed"]
+
+def post_mouse(event_type: int, pos: "tuple[int, int]") -> bool:
+    if event_type == pygame.MOUSEMOTION:
+        event = pygame.event.Event(event_type, {"pos": pos, "rel": (0, 0), "buttons": (0, 0, 0)})
+    else:
+        event = pygame.event.Event(event_type, {"pos": pos, "button": 1})
+
+    try:
+        return bool(pygame.event.post(event))
+    except pygame.error:
+        return False
+
+def get_percentile(values: "list[float]", percentile: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(percentile / 100 * len(ordered)))]
+
+def get_sweep_positions(craps: Craps.Craps, frame: int, count: int) -> "list[tuple[int, int]]":
+    width = craps.screen_rect.width
+    height = craps.screen_rect.height
+    row = (frame * 37) % height
+
+    return [(index * width // max(count, 1), row) for index in range(count)]
+
+def get_frame_events(craps: Craps.Craps, scenario: str, frame: int, count: int, rng: random.Random) -> "list[tuple[int, tuple[int, int]]]":
+    bets = list(craps.bet_manager.coordinate_mapping.values())
+    dice_pos = craps.dice_manager.dice_set.rect.center
+    chip_rect = craps.chip_tray_manager.chip_tray.rect
+
+    if scenario == "sweep":
+        return [(pygame.MOUSEMOTION, pos) for pos in get_sweep_positions(craps, frame, count)]
+
+    elif scenario == "clicks":
+        events: "list[tuple[int, tuple[int, int]]]" = []
+        for index in range(count):
+            bet = rng.choice(bets)
+            events.append((pygame.MOUSEBUTTONDOWN, (int(bet[0] * craps.screen_rect.width), int(bet[1] * craps.screen_rect.height))))
+
+        return events
+
+    elif scenario == "rolls":
+        return [(pygame.MOUSEBUTTONDOWN, dice_pos)] * count
+
+    elif scenario == "mixed":
+        events = [(pygame.MOUSEMOTION, pos) for pos in get_sweep_positions(craps, frame, count // 2)]
+        events += get_frame_events(craps, "clicks", frame, count // 4, rng)
+        events += [(pygame.MOUSEBUTTONDOWN, (rng.randrange(chip_rect.left, chip_rect.right), chip_rect.centery))]
+        events += get_frame_events(craps, "rolls", frame, count - len(events), rng)
+        rng.shuffle(events)
+        return events
+
+    else:
+        raise RuntimeError("Invalid scenario: %s" % scenario)
+
+def run_scenario(craps: Craps.Craps, scenario: str, frames: int, events_per_frame: int, seed: int, trace_memory: bool) -> dict:
+    rng = random.Random(seed)
+    pygame.event.clear()
+    craps.pending_events.clear()
+
+    injected = 0
+    posted = 0
+    handled = 0
+    coalesced = 0
+    overflow = 0
+    deferred = 0
+    event_seconds = 0.0
+    frame_times: "list[float]" = []
+
+    if trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in range(frames):
+            for event_type, pos in get_frame_events(craps, scenario, frame, events_per_frame, rng):
+                injected += 1
+                posted += post_mouse(event_type, pos)
+
+            frame_start = time.perf_counter()
+            craps.step(1000 // craps.fps)
+            frame_times.append((time.perf_counter() - frame_start) * 1000)
+
+            handled += craps.event_stats["handled"]
+            coalesced += craps.event_stats["coalesced"]
+            overflow += craps.event_stats["overflow"]
+            deferred = max(deferred, craps.event_stats["deferred"])
+            event_seconds += craps.event_stats["ms"] / 1000
+
+    elapsed = time.perf_counter() - start
+    peak_kib = 0.0
+
+    if trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_kib = peak / 1024
+
+    return {
+        "scenario": scenario,
+        "frames": frames,
+        "injected": injected,
+        "dropped": injected - posted,
+        "coalesced": coalesced,
+        "overflow": overflow,
+        "handled": handled,
+        "max_deferred": deferred,
+        "backlog": len(craps.pending_events) + len(pygame.event.get()),
+        "events_per_sec": handled / event_seconds if event_seconds else 0.0,
+        "injected_per_sec": injected / elapsed if elapsed else 0.0,
+        "frame_p50": get_percentile(frame_times, 50),
+        "frame_p95": get_percentile(frame_times, 95),
+        "frame_p99": get_percentile(frame_times, 99),
+        "frame_max": max(frame_times, default=0.0),
+        "traced_peak_kib": peak_kib,
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "components_peak": craps.registry.get_metrics()["components_peak"]
+    }
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Drive the craps UI with synthetic mouse input and report event pipeline load.")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, default=[])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--events-per-frame", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true", help="Track Python allocation peaks with tracemalloc (slows frames)")
+    args = parser.parse_args(argv)
+
+    craps = Craps.Craps("Craps Stress Test", (1280, 1280 // 2))
+
+    for scenario in args.scenario or SCENARIOS:
+        result = run_scenario(craps, scenario, args.frames, args.events_per_frame, args.seed, args.trace_memory)
+        print(("%(scenario)s: frames=%(frames)d injected=%(injected)d dropped=%(dropped)d coalesced=%(coalesced)d overflow=%(overflow)d handled=%(handled)d "
+               "max_deferred=%(max_deferred)d backlog=%(backlog)d injected/sec=%(injected_per_sec).0f events/sec=%(events_per_sec).0f frame_ms p50=%(frame_p50).2f p95=%(frame_p95).2f "
+               "p99=%(frame_p99).2f max=%(frame_max).2f traced_peak=%(traced_peak_kib).1fKiB max_rss=%(max_rss_kib)dKiB components_peak=%(components_peak)d") % result)
+
+    craps.what_if_manager.shutdown()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
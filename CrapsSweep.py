@@ -0,0 +1,225 @@
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import itertools
+import json
+import os
+import sys
+
+from CrapsRules import get_settlement_table
+from CrapsSimulation import simulate
+from CrapsStore import ColumnStore, format_strategy, make_session_columns
+
+RESULT_FIELDS = ["key", "base_bet", "place", "stop_loss", "stop_win", "rules", "seed", "rolls", "start_money", "money", "min_money", "max_money", "wagered", "stop_reason"]
+
+class ResultCache:
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(cell: dict) -> str:
+        encoded = json.dumps(cell, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> "dict | None":
+        path = self.get_path(key)
+
+        try:
+            with open(path, "r") as file:
+                result = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        os.utime(path)
+        return result
+
+    def put(self, key: str, result: dict) -> None:
+        path = self.get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        temp_path = "%s.%d.tmp" % (path, os.getpid())
+        with open(temp_path, "w") as file:
+            json.dump(result, file, sort_keys=True)
+        os.replace(temp_path, path)
+
+    def get_entries(self) -> "list[tuple[float, int, str]]":
+        entries: "list[tuple[float, int, str]]" = []
+
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        return entries
+
+    def evict(self) -> int:
+        entries = self.get_entries()
+        total_size = sum(size for mtime, size, path in entries)
+        evicted = 0
+
+        for mtime, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+
+            total_size -= size
+            evicted += 1
+
+        return evicted
+
+def build_strategy_config(base_bet: int, place: "list[int]", stop_loss: int, stop_win: int) -> dict:
+    bets = {"Pass Line": base_bet}
+    for number in place:
+        bets["Place %d" % number] = base_bet
+
+    return {
+        "bets": dict(sorted(bets.items())),
+        "stop_loss": stop_loss,
+        "stop_win": stop_win
+    }
+
+def expand_grid(grid: dict, seeds: "list[int]", rolls: int, rules: str = "standard") -> "list[dict]":
+    cells: "list[dict]" = []
+    rules_config = get_settlement_table(rules).profile.to_config()
+
+    for base_bet, place, stop_loss, stop_win, seed in itertools.product(
+            grid.get("base_bet", [5]),
+            grid.get("place", [[]]),
+            grid.get("stop_loss", [0]),
+            grid.get("stop_win", [0]),
+            seeds):
+        cells.append({
+            "base_bet": base_bet,
+            "place": sorted(place),
+            "stop_loss": stop_loss,
+            "stop_win": stop_win,
+            "strategy": build_strategy_config(base_bet, place, stop_loss, stop_win),
+            "rules": rules,
+            "rules_config": rules_config,
+            "seed": seed,
+            "rolls": rolls
+        })
+
+    return cells
+
+def run_cell(cell: dict) -> dict:
+    result = simulate(cell["strategy"], cell["seed"], cell["rolls"], cell["rules"])
+    return result.to_dict()
+
+def sweep(cells: "list[dict]", cache: ResultCache, workers: int = 1) -> "list[dict]":
+    keys = [ResultCache.make_key(cell) for cell in cells]
+    results: "dict[str, dict]" = {}
+    missing: "dict[str, dict]" = {}
+
+    for key, cell in zip(keys, cells):
+        if key in results or key in missing:
+            continue
+
+        result = cache.get(key)
+        if result is None:
+            missing[key] = cell
+        else:
+            results[key] = result
+
+    if missing:
+        if workers > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(run_cell, cell): key for key, cell in missing.items()}
+                for future in concurrent.futures.as_completed(futures):
+                    key = futures[future]
+                    results[key] = future.result()
+                    cache.put(key, results[key])
+        else:
+            for key, cell in missing.items():
+                results[key] = run_cell(cell)
+                cache.put(key, results[key])
+
+        cache.evict()
+
+    rows: "list[dict]" = []
+    for key, cell in zip(keys, cells):
+        row = {
+            "key": key,
+            "base_bet": cell["base_bet"],
+            "place": "/".join("%d" % number for number in cell["place"]),
+            "stop_loss": cell["stop_loss"],
+            "stop_win": cell["stop_win"],
+            "rules": cell["rules"],
+            "seed": cell["seed"]
+        }
+        row.update(results[key])
+        rows.append(row)
+
+    return rows
+
+def write_rows(rows: "list[dict]", path: str) -> None:
+    if path == "-":
+        file = sys.stdout
+    else:
+        file = open(path, "w", newline="")
+
+    try:
+        if path.endswith(".json"):
+            json.dump(rows, file, indent=2)
+            file.write("\n")
+        else:
+            writer = csv.DictWriter(file, RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+def store_rows(rows: "list[dict]", store: ColumnStore) -> int:
+    columns = {field: [row[field] for row in rows] for field in RESULT_FIELDS if field != "key"}
+    columns["source"] = "sweep"
+    columns["strategy"] = [format_strategy(build_strategy_config(row["base_bet"], [int(number) for number in row["place"].split("/") if number], 0, 0)["bets"]) for row in rows]
+
+    return store.append(make_session_columns(len(rows), columns))
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a cached craps strategy parameter sweep.")
+    parser.add_argument("grid", help="JSON file with base_bet, place, stop_loss and stop_win lists")
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--rolls", type=int, default=1000)
+    parser.add_argument("--rules", default="standard")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cache-dir", default=".craps_cache")
+    parser.add_argument("--cache-size", type=int, default=256, help="Cache size limit in MiB")
+    parser.add_argument("--output", default="-", help="CSV or .json output path")
+    parser.add_argument("--store", help="Also append rows to a columnar store directory")
+    args = parser.parse_args(argv)
+
+    with open(args.grid, "r") as file:
+        grid = json.load(file)
+
+    cache = ResultCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    cells = expand_grid(grid, list(range(args.seeds)), args.rolls, args.rules)
+    rows = sweep(cells, cache, args.workers)
+
+    write_rows(rows, args.output)
+
+    if args.store:
+        store_rows(rows, ColumnStore(args.store))
+
+if __name__ == "__main__":
+    main()
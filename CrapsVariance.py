@@ -0,0 +1,171 @@
+import argparse
+import random
+
+from CrapsRules import WIN, LOSE, get_bet_odds, get_dice_outcomes, get_settlement_table, next_point
+from CrapsSimulation import Simulation, Strategy, parse_bets, roll_dice
+
+SAMPLING_INDEPENDENT = "independent"
+SAMPLING_STRATIFIED = "stratified"
+
+def get_mean(values: "list[float]") -> float:
+    return sum(values) / len(values)
+
+def get_covariance(first: "list[float]", second: "list[float]") -> float:
+    if len(first) < 2:
+        return 0.0
+
+    first_mean = get_mean(first)
+    second_mean = get_mean(second)
+    return sum((a - first_mean) * (b - second_mean) for a, b in zip(first, second)) / (len(first) - 1)
+
+def get_variance(values: "list[float]") -> float:
+    return get_covariance(values, values)
+
+def get_first_rolls(rng: random.Random, sessions: int, sampling: str = SAMPLING_INDEPENDENT) -> "list[list[int]]":
+    if sampling == SAMPLING_INDEPENDENT:
+        return [roll_dice(rng) for session in range(sessions)]
+
+    elif sampling == SAMPLING_STRATIFIED:
+        first_rolls: "list[list[int]]" = []
+        outcomes = get_dice_outcomes()
+
+        while len(first_rolls) < sessions:
+            rng.shuffle(outcomes)
+            first_rolls.extend(list(dice_values) for dice_values in outcomes)
+
+        return first_rolls[:sessions]
+
+    else:
+        raise RuntimeError("Invalid sampling: %s" % sampling)
+
+def make_dice_sequence(rng: random.Random, rolls: int, first_roll: "list[int]" = None) -> "list[list[int]]":
+    if first_roll is None or rolls == 0:
+        return [roll_dice(rng) for roll in range(rolls)]
+
+    return [list(first_roll)] + [roll_dice(rng) for roll in range(rolls - 1)]
+
+def get_antithetic_sequence(sequence: "list[list[int]]") -> "list[list[int]]":
+    return [[7 - value for value in dice_values] for dice_values in sequence]
+
+def get_pass_line_control(sequence: "list[list[int]]", rolls: int, rules: str = "standard") -> float:
+    settlement_table = get_settlement_table(rules)
+    current_point = 0
+    control = 0.0
+
+    for dice_values in sequence[:rolls]:
+        dice_total = sum(dice_values)
+        outcome, win, to = settlement_table.settle("Pass Line", current_point, dice_values)
+
+        if outcome == WIN:
+            control += win / to
+        elif outcome == LOSE:
+            control -= 1
+
+        control -= float(get_bet_odds("Pass Line", current_point, rules).roll_expected_value)
+        current_point = next_point(current_point, dice_total)
+
+    return control
+
+class Estimate:
+    def __init__(self, name: str, samples: "list[float]", sessions_per_sample: int, baseline_variance: float) -> None:
+        self.name = name
+        self.samples = samples
+        self.mean = get_mean(samples)
+        self.variance = get_variance(samples)
+        self.standard_error = (self.variance / len(samples)) ** 0.5
+
+        if self.variance > 0:
+            self.reduction = baseline_variance / (self.variance * sessions_per_sample)
+        else:
+            self.reduction = float("inf")
+
+def apply_control_variate(samples: "list[float]", controls: "list[float]") -> "list[float]":
+    control_variance = get_variance(controls)
+    if control_variance == 0:
+        return samples
+
+    beta = get_covariance(samples, controls) / control_variance
+    return [sample - beta * control for sample, control in zip(samples, controls)]
+
+def run_plain(strategies: "list[Strategy]", sessions: int, rolls: int, seed: int, money: int = 10000, rules: str = "standard") -> "list[list[float]]":
+    samples: "list[list[float]]" = [[] for strategy in strategies]
+
+    for index, strategy in enumerate(strategies):
+        rng = random.Random("%d:plain:%d" % (seed, index))
+        for session in range(sessions):
+            result = Simulation(strategy, rules, money).run(rng, rolls)
+            samples[index].append((result.money - result.start_money) / 100)
+
+    return samples
+
+def run_common(strategies: "list[Strategy]", sessions: int, rolls: int, seed: int, sampling: str = SAMPLING_INDEPENDENT, antithetic: bool = False, money: int = 10000, rules: str = "standard") -> "tuple[list[list[float]], list[list[float]]]":
+    rng = random.Random("%d:common" % seed)
+    samples: "list[list[float]]" = [[] for strategy in strategies]
+    controls: "list[list[float]]" = [[] for strategy in strategies]
+
+    first_rolls = get_first_rolls(rng, sessions, sampling)
+
+    for session in range(sessions):
+        sequence = make_dice_sequence(rng, rolls, first_rolls[session])
+        sequences = [sequence]
+        if antithetic:
+            sequences.append(get_antithetic_sequence(sequence))
+
+        for index, strategy in enumerate(strategies):
+            deltas: "list[float]" = []
+            session_controls: "list[float]" = []
+
+            for dice_sequence in sequences:
+                result = Simulation(strategy, rules, money).run_sequence(dice_sequence)
+                deltas.append((result.money - result.start_money) / 100)
+                session_controls.append(get_pass_line_control(dice_sequence, result.rolls, rules))
+
+            samples[index].append(get_mean(deltas))
+            controls[index].append(get_mean(session_controls))
+
+    return samples, controls
+
+def compare(strategies: "list[Strategy]", sessions: int, rolls: int, seed: int, sampling: str = SAMPLING_STRATIFIED, antithetic: bool = True, control: bool = True, money: int = 10000, rules: str = "standard") -> "list[Estimate]":
+    plain = run_plain(strategies, sessions, rolls, seed, money, rules)
+    samples, controls = run_common(strategies, sessions, rolls, seed, sampling, antithetic, money, rules)
+    sessions_per_sample = 2 if antithetic else 1
+
+    if control:
+        samples = [apply_control_variate(strategy_samples, strategy_controls) for strategy_samples, strategy_controls in zip(samples, controls)]
+
+    estimates: "list[Estimate]" = []
+    names = ["Strategy %d" % (index + 1) for index in range(len(strategies))]
+
+    for name, strategy_samples, plain_samples in zip(names, samples, plain):
+        estimates.append(Estimate(name, strategy_samples, sessions_per_sample, get_variance(plain_samples)))
+
+    for index in range(1, len(strategies)):
+        differences = [sample - first for sample, first in zip(samples[index], samples[0])]
+        baseline_variance = get_variance(plain[index]) + get_variance(plain[0])
+        estimates.append(Estimate("%s - %s" % (names[index], names[0]), differences, sessions_per_sample, baseline_variance))
+
+    return estimates
+
+def main(argv: "list[str]" = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare craps strategies with variance-reduced simulation.")
+    parser.add_argument("--strategy", action="append", default=[], help='Comma separated bets, e.g. "Pass Line=5,Place 6=6"')
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--rolls", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rules", default="standard")
+    parser.add_argument("--sampling", choices=[SAMPLING_INDEPENDENT, SAMPLING_STRATIFIED], default=SAMPLING_STRATIFIED)
+    parser.add_argument("--no-antithetic", action="store_true")
+    parser.add_argument("--no-control", action="store_true")
+    args = parser.parse_args(argv)
+
+    strategies = [Strategy(parse_bets(value.split(","))) for value in args.strategy or ["Pass Line=5", "Pass Line=5,Place 6=6,Place 8=6"]]
+    estimates = compare(strategies, args.sessions, args.rolls, args.seed, args.sampling, not args.no_antithetic, not args.no_control, rules=args.rules)
+
+    for index, strategy in enumerate(strategies):
+        print("Strategy %d: %s" % (index + 1, ", ".join("%s $%d" % item for item in strategy.bets.items())))
+
+    for estimate in estimates:
+        print("%s: mean $%.3f +/- %.3f, variance reduction x%.2f" % (estimate.name, estimate.mean, estimate.standard_error, estimate.reduction))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import itertools
+
+import pytest
+
+from CrapsAnalysis import RuinSolver, get_bankroll_distribution
+from CrapsRules import WIN, LOSE, get_dice_outcomes, get_settlement_table, next_point
+
+def enumerate_bankrolls(bets: "dict[str, int]", money: int, rolls: int) -> "dict[int, float]":
+    settlement_table = get_settlement_table()
+    outcomes = get_dice_outcomes()
+    distribution: "dict[int, float]" = {}
+
+    for sequence in itertools.product(outcomes, repeat=rolls):
+        point = 0
+        bankroll = money
+
+        for dice_values in sequence:
+            for bet, amount in bets.items():
+                outcome, win, to = settlement_table.settle(bet, point, dice_values)
+                if outcome == WIN:
+                    bankroll += amount * 100 * win // to
+                elif outcome == LOSE:
+                    bankroll -= amount * 100
+
+            point = next_point(point, sum(dice_values))
+
+        distribution[bankroll] = distribution.get(bankroll, 0.0) + len(outcomes) ** -rolls
+
+    return distribution
+
+def test_distribution_matches_enumeration() -> None:
+    bets = {"Pass Line": 5, "Place 6": 6}
+    expected = enumerate_bankrolls(bets, 100000, 3)
+    distribution = get_bankroll_distribution(bets, 100000, 3, tolerance=0.0)
+
+    actual = {int(bankroll): float(probability) for bankroll, probability in zip(distribution.bankrolls, distribution.probabilities) if probability > 0}
+    assert actual.keys() == expected.keys()
+    assert all(actual[bankroll] == pytest.approx(probability, abs=1e-12) for bankroll, probability in expected.items())
+    assert distribution.ruin_probability == 0.0
+    assert distribution.get_mean() == pytest.approx(sum(bankroll * probability for bankroll, probability in expected.items()))
+
+def test_distribution_absorbs_ruin_and_prunes() -> None:
+    distribution = get_bankroll_distribution({"Any 7": 5}, 1500, 20)
+
+    assert distribution.ruin_probability > 0.5
+    assert distribution.bankrolls.min() >= 500
+    total = distribution.probabilities.sum() + distribution.ruin_probability + distribution.pruned_probability
+    assert total == pytest.approx(1.0, abs=1e-9)
+
+def test_ruin_solver_matches_gamblers_ruin() -> None:
+    result = RuinSolver({"Pass Line": 1}, money=500, target=1000).solve()
+    ratio = (251 / 495) / (244 / 495)
+    target_probability = (1 - ratio ** 5) / (1 - ratio ** 10)
+
+    assert result.target_probability == pytest.approx(target_probability, abs=1e-9)
+    assert result.ruin_probability == pytest.approx(1 - target_probability, abs=1e-9)
+
+def test_ruin_solver_blocks_match_single_rolls() -> None:
+    solver = RuinSolver({"Pass Line": 5}, money=10000, target=20000)
+    single = solver.solve(block_rolls=1)
+    blocked = solver.solve(block_rolls=4)
+    ratio = (251 / 495) / (244 / 495)
+    target_probability = (1 - ratio ** 20) / (1 - ratio ** 40)
+
+    assert len(solver.get_bankrolls()) > 4 * 4
+    assert blocked.target_probability == pytest.approx(target_probability, abs=1e-9)
+    assert blocked.ruin_times[:len(single.ruin_times)] == pytest.approx(single.ruin_times, abs=1e-12)
+    assert blocked.target_times[:len(single.target_times)] == pytest.approx(single.target_times, abs=1e-12)
+
+def test_ruin_solver_rejects_bankroll_outside_bounds() -> None:
+    with pytest.raises(RuntimeError):
+        RuinSolver({"Pass Line": 5}, money=30000, target=20000)
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+import CrapsBatch
+
+ARGS = ["--bet", "Pass Line=5", "--sessions", "23", "--rolls", "50", "--chunk-size", "4", "--seed", "7", "--quiet"]
+
+def read_lines(path: str) -> "list[dict]":
+    with open(path, "r") as file:
+        return [json.loads(line) for line in file]
+
+def test_streams_one_line_per_session(tmp_path) -> None:
+    output = str(tmp_path / "sessions.jsonl")
+    CrapsBatch.main(ARGS + ["--output", output])
+
+    lines = read_lines(output)
+    assert [line["session"] for line in lines] == list(range(23))
+    assert all(line["seed"] == 7 + line["session"] for line in lines)
+    assert all(line["rolls"] <= 50 and line["start_money"] == 10000 for line in lines)
+
+def test_per_chunk_summaries(tmp_path) -> None:
+    output = str(tmp_path / "chunks.jsonl")
+    CrapsBatch.main(ARGS + ["--output", output, "--per-chunk"])
+
+    lines = read_lines(output)
+    assert [line["first_session"] for line in lines] == [0, 4, 8, 12, 16, 20]
+    assert sum(line["sessions"] for line in lines) == 23
+
+def test_parallel_matches_serial(tmp_path) -> None:
+    serial = str(tmp_path / "serial.jsonl")
+    parallel = str(tmp_path / "parallel.jsonl")
+    CrapsBatch.main(ARGS + ["--output", serial])
+    CrapsBatch.main(ARGS + ["--output", parallel, "--workers", "2"])
+
+    key = lambda line: line["session"]
+    assert sorted(read_lines(serial), key=key) == sorted(read_lines(parallel), key=key)
+
+def test_resume_after_interrupt(tmp_path, monkeypatch) -> None:
+    expected = str(tmp_path / "expected.jsonl")
+    output = str(tmp_path / "output.jsonl")
+    checkpoint = str(tmp_path / "batch.checkpoint")
+    CrapsBatch.main(ARGS + ["--output", expected])
+
+    run_chunk = CrapsBatch.run_chunk
+    calls = []
+
+    def interrupted_chunk(*args: object) -> "list[dict]":
+        calls.append(args)
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+
+        return run_chunk(*args)
+
+    monkeypatch.setattr(CrapsBatch, "run_chunk", interrupted_chunk)
+    CrapsBatch.main(ARGS + ["--output", output, "--checkpoint", checkpoint])
+    assert len(read_lines(output)) == 12
+
+    monkeypatch.setattr(CrapsBatch, "run_chunk", run_chunk)
+    CrapsBatch.main(ARGS + ["--output", output, "--checkpoint", checkpoint, "--resume"])
+    assert read_lines(output) == read_lines(expected)
+
+def test_resume_rejects_different_run(tmp_path) -> None:
+    output = str(tmp_path / "output.jsonl")
+    checkpoint = str(tmp_path / "batch.checkpoint")
+    CrapsBatch.main(ARGS + ["--output", output, "--checkpoint", checkpoint])
+
+    with pytest.raises(RuntimeError):
+        CrapsBatch.main(ARGS + ["--output", output, "--checkpoint", checkpoint, "--resume", "--seed", "8"])
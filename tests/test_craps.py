@@ -0,0 +1,198 @@
+import concurrent.futures.process
+import contextlib
+import io
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+import Craps
+import CrapsRules
+from CrapsState import TableState, save_checkpoint
+
+@pytest.fixture
+def craps() -> Craps.Craps:
+    craps = Craps.Craps("Craps Test", (1280, 640))
+    pygame.event.clear()
+    yield craps
+    craps.what_if_manager.shutdown()
+
+def click(pos: "tuple[int, int]") -> None:
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, {"pos": pos, "button": 1}))
+
+def test_idle_wake_does_not_skip_animation(craps: Craps.Craps) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        craps.step(Craps.STEP_MS)
+        click(craps.dice_manager.dice_set.rect.center)
+        craps.step(30000)
+
+    assert craps.dice_manager.dice_set.tumble_ms >= 600 - Craps.STEP_MS
+
+def test_deferred_events_are_bounded(craps: Craps.Craps) -> None:
+    craps.event_budget_ms = 0
+    craps.max_pending_events = 16
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in range(5):
+            for index in range(50):
+                pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, {"pos": (index, index), "rel": (0, 0), "buttons": (0, 0, 0)}))
+                click((index, 10))
+
+            craps.step(Craps.STEP_MS)
+            assert craps.event_stats["handled"] >= 1
+            assert len(craps.pending_events) <= 16
+
+def test_budget_keeps_discrete_input_and_warns_once(craps: Craps.Craps, monkeypatch) -> None:
+    craps.event_budget_ms = 0
+    craps.max_pending_events = 4
+    seen: "list[int]" = []
+    handle_event = Craps.UIComponent.handle_event
+
+    def record(component: Craps.UIComponent, event: pygame.event.Event, events_to_post: "list[pygame.event.Event]") -> None:
+        if component is craps.ui_component and event.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
+            seen.append(event.type)
+        handle_event(component, event, events_to_post)
+
+    monkeypatch.setattr(Craps.UIComponent, "handle_event", record)
+    for index in range(6):
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, {"pos": (index, 0), "rel": (0, 0), "buttons": (0, 0, 0)}))
+        click((index, 0))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, {"key": pygame.K_z, "mod": 0, "unicode": "z", "scancode": 0}))
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        craps.step(Craps.STEP_MS)
+        assert craps.event_stats["overflow"] > 0
+        assert len(craps.pending_events) == 4
+
+        for frame in range(5):
+            craps.step(Craps.STEP_MS)
+            assert len(craps.pending_events) <= 4
+
+    assert not craps.pending_events
+    assert seen.count(pygame.MOUSEBUTTONDOWN) == 6
+    assert seen.count(pygame.KEYDOWN) == 6
+    assert output.getvalue().count("Event Budget Exceeded") == 1
+
+def test_hidden_panels_are_not_drawn(craps: Craps.Craps, monkeypatch) -> None:
+    drawn = []
+    for panel in (craps.odds_manager, craps.what_if_manager, craps.history_manager):
+        monkeypatch.setattr(type(panel), "draw", lambda self, surface, bounds: drawn.append(self))
+
+    craps.step(Craps.STEP_MS)
+    assert drawn == []
+
+    craps.what_if_manager.visible = True
+    craps.step(Craps.STEP_MS)
+    assert drawn == [craps.what_if_manager]
+    assert craps.what_if_manager.rect.size < craps.screen_rect.size
+
+def test_what_if_worker_error_is_shown_and_dropped(craps: Craps.Craps, monkeypatch) -> None:
+    def failing_sessions(*args: object) -> "list[int]":
+        raise ValueError("worker failed")
+
+    monkeypatch.setattr(Craps, "run_sessions", failing_sessions)
+    what_if = craps.what_if_manager
+    what_if.executor = Craps.concurrent.futures.ThreadPoolExecutor(1)
+    what_if.cancel_token = Craps.CancelToken()
+    what_if.sessions = what_if.chunk_size * 2
+    craps.bet_manager.bets["Pass Line"] = 5
+
+    what_if.start_simulation()
+    Craps.concurrent.futures.wait(what_if.futures)
+    what_if.collect_results()
+
+    assert what_if.futures == []
+    assert what_if.completed == 0
+    assert what_if.error == "ValueError: worker failed"
+
+def test_broken_pool_releases_cancel_token(craps: Craps.Craps) -> None:
+    what_if = craps.what_if_manager
+    what_if.executor = Craps.concurrent.futures.ThreadPoolExecutor(1)
+    what_if.cancel_token = token = Craps.CancelToken()
+    broken = Craps.concurrent.futures.Future()
+    broken.set_exception(concurrent.futures.process.BrokenProcessPool("pool died"))
+    what_if.futures = [broken]
+
+    what_if.collect_results()
+
+    assert what_if.executor is None
+    assert what_if.cancel_token is None
+    with pytest.raises(FileNotFoundError):
+        Craps.CancelToken(token.memory.name)
+
+def test_hover_odds_are_a_lookup(monkeypatch) -> None:
+    monkeypatch.setattr(CrapsRules, "odds_tables", {})
+    craps = Craps.Craps("Craps Test", (1280, 640), "vegas")
+
+    def fail(settlement_table: CrapsRules.SettlementTable) -> dict:
+        raise AssertionError("odds table rebuilt on hover")
+
+    try:
+        monkeypatch.setattr(CrapsRules, "build_odds_table", fail)
+        events_to_post: "list[pygame.event.Event]" = []
+        craps.bet_manager.handle_event(pygame.event.Event(Craps.TABLE_BET_MOUSEMOTION, {"pos": (0, 0), "screen_pos": (0, 0), "color": (0, 0, 0), "bet": "Field"}), events_to_post)
+        craps.bet_manager.add_bet("Pass Line", 5)
+    finally:
+        craps.what_if_manager.shutdown()
+
+    assert events_to_post[0].odds is CrapsRules.get_bet_odds("Field", 0, "vegas")
+    assert craps.bet_manager.layout_roll_ev[0] == 5 * CrapsRules.get_bet_odds("Pass Line", 0, "vegas").roll_expected_value
+
+def test_checkpoint_replays_dice(craps: Craps.Craps, tmp_path) -> None:
+    path = str(tmp_path / "table.checkpoint")
+    dice = craps.dice_manager
+    save_checkpoint(path, craps.get_state(), dice.rng, dice.rolls)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        click(dice.dice_set.rect.center)
+        craps.step(Craps.STEP_MS)
+        first = list(dice.dice_set.values)
+
+        assert craps.load_table_checkpoint(path)
+        assert dice.rolls == 0
+        click(dice.dice_set.rect.center)
+        craps.step(Craps.STEP_MS)
+
+    assert dice.rolls == 1
+    assert dice.dice_set.values == first
+
+@pytest.mark.parametrize("corruption", ["empty", "garbage", "truncated", "unplaced_bet"])
+def test_failed_checkpoint_load_keeps_table(craps: Craps.Craps, tmp_path, corruption: str) -> None:
+    path = tmp_path / "table.checkpoint"
+    save_checkpoint(str(path), TableState(6, 5000, {"Pass Line": 5, "Pass Odds": 10} if corruption == "unplaced_bet" else {"Pass Line": 5}), craps.dice_manager.rng)
+
+    if corruption == "empty":
+        path.write_bytes(b"")
+    elif corruption == "garbage":
+        path.write_bytes(b"\x00\x01garbage")
+    elif corruption == "truncated":
+        path.write_bytes(path.read_bytes()[:-100])
+
+    craps.bet_manager.add_bet("Field", 5)
+    before = craps.get_state()
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert not craps.load_table_checkpoint(str(path))
+
+    assert "Failed To Load Checkpoint" in output.getvalue()
+    assert craps.get_state() == before
+
+def test_history_panel_tracks_rolls_in_its_own_rect(craps: Craps.Craps) -> None:
+    history = craps.history_manager
+    assert history.rect.width < craps.screen_rect.width // 2
+    assert history.rect.height < craps.screen_rect.height // 2
+
+    history.visible = True
+    with contextlib.redirect_stdout(io.StringIO()):
+        for roll in range(3):
+            click(craps.dice_manager.dice_set.rect.center)
+            for frame in range(60):
+                craps.step(Craps.STEP_MS)
+
+    assert len(history.rolls) == 3
+    assert history.frame_surface.get_size() == history.rect.size
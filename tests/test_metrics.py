@@ -0,0 +1,116 @@
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import Craps
+import CrapsMetrics
+
+def test_exposition_format() -> None:
+    registry = CrapsMetrics.MetricsRegistry()
+    registry.counter("test_total", "Plain counter").inc(3)
+    labelled = registry.counter("test_labelled_total", "Labelled counter", "bet")
+    labelled.inc(1, "Pass Line")
+    labelled.inc(2, "Say \"hi\"")
+    registry.gauge("test_gauge", "Gauge", function=lambda: 1.5)
+
+    lines = registry.expose().splitlines()
+
+    assert lines == [
+        "# HELP test_gauge Gauge",
+        "# TYPE test_gauge gauge",
+        "test_gauge 1.5",
+        "# HELP test_labelled_total Labelled counter",
+        "# TYPE test_labelled_total counter",
+        "test_labelled_total{bet=\"Pass Line\"} 1",
+        "test_labelled_total{bet=\"Say \\\"hi\\\"\"} 2",
+        "# HELP test_total Plain counter",
+        "# TYPE test_total counter",
+        "test_total 3"
+    ]
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = CrapsMetrics.Histogram("test_seconds", "Histogram", (1, 2, 5))
+    for value in (0.5, 1, 1.5, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.get_samples() == [
+        ("test_seconds_bucket", "{le=\"1\"}", 2),
+        ("test_seconds_bucket", "{le=\"2\"}", 3),
+        ("test_seconds_bucket", "{le=\"5\"}", 4),
+        ("test_seconds_bucket", "{le=\"+Inf\"}", 5),
+        ("test_seconds_sum", "", 16.0),
+        ("test_seconds_count", "", 5)
+    ]
+
+    with pytest.raises(RuntimeError):
+        CrapsMetrics.Histogram("test_bad_seconds", "Histogram", (2, 1))
+
+def test_register_rejects_kind_change() -> None:
+    registry = CrapsMetrics.MetricsRegistry()
+    counter = registry.counter("test_total", "Counter")
+
+    assert registry.counter("test_total", "Counter") is counter
+    with pytest.raises(RuntimeError):
+        registry.histogram("test_total", "Histogram", (1,))
+
+def test_rate_counts_marks_in_window() -> None:
+    rate = CrapsMetrics.Rate("test_per_minute", "Rate", window=60.0, per=60.0)
+    rate.times.extend((0.0, 10.0, 50.0, 70.0))
+
+    assert rate.get(60.0) == 4
+    assert rate.get(100.0) == 2
+    assert rate.get(200.0) == 0
+
+    rate.mark()
+    assert list(rate.times)[-1] > 70.0
+    assert len(rate.times) == 1
+
+def test_server_serves_registry() -> None:
+    registry = CrapsMetrics.MetricsRegistry()
+    registry.counter("test_total", "Counter").inc()
+    server = CrapsMetrics.start_server(0, registry)
+
+    try:
+        url = "http://127.0.0.1:%d" % server.server_address[1]
+        with urllib.request.urlopen(url + "/metrics") as response:
+            assert response.headers["Content-Type"] == CrapsMetrics.CONTENT_TYPE
+            assert "test_total 1" in response.read().decode("utf-8").splitlines()
+
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/missing")
+    finally:
+        server.shutdown()
+
+def test_table_metrics_are_disabled_without_port() -> None:
+    assert Craps.metrics is None
+
+    craps = Craps.Craps("Craps Test", (1280, 640))
+    try:
+        craps.step(Craps.STEP_MS)
+        craps.bet_manager.dice_rolled(7, [3, 4], [])
+    finally:
+        craps.what_if_manager.shutdown()
+
+    assert Craps.metrics is None
+
+def test_table_metrics_record_rolls_when_enabled() -> None:
+    craps = Craps.Craps("Craps Test", (1280, 640))
+    server = Craps.enable_metrics(craps, 0)
+
+    try:
+        craps.bet_manager.add_bet("Pass Line", 5)
+        craps.bet_manager.dice_rolled(7, [3, 4], [])
+        exposition = Craps.metrics.registry.expose().splitlines()
+    finally:
+        server.shutdown()
+        craps.what_if_manager.shutdown()
+        Craps.metrics = None
+
+    assert "craps_rolls_total 1" in exposition
+    assert "craps_rolls_per_minute 1.0" in exposition
+    assert "craps_bet_outcomes_total{outcome=\"win\"} 1" in exposition
@@ -0,0 +1,78 @@
+from fractions import Fraction
+
+import pytest
+
+from CrapsRules import BETS, ODDS_BETS, POINTS, STATES, WIN, RuleProfile, SettlementTable, build_odds_table, determine_bet_outcome, get_bet_odds, get_dice_outcomes, get_settlement_table, load_rule_profiles, next_point
+
+@pytest.mark.parametrize("rules", sorted(load_rule_profiles()))
+def test_settlement_table_matches_outcomes(rules: str) -> None:
+    table = get_settlement_table(rules)
+
+    for bet in table.bets:
+        for state in STATES:
+            for dice_values in get_dice_outcomes():
+                assert table.settle(bet, state, dice_values) == determine_bet_outcome(bet, state, sum(dice_values), dice_values, table.profile)
+
+@pytest.mark.parametrize("bet, current_point, house_edge", [
+    ("Pass Line", 0, Fraction(7, 495)),
+    ("Don't Pass", 0, Fraction(27, 1925)),
+    ("Field", 0, Fraction(1, 18)),
+    ("Place 6", 6, Fraction(1, 66)),
+    ("Place 4", 4, Fraction(1, 15)),
+    ("Any 7", 0, Fraction(1, 6)),
+    ("Hard 8", 8, Fraction(1, 11))
+])
+def test_standard_house_edges(bet: str, current_point: int, house_edge: Fraction) -> None:
+    assert get_bet_odds(bet, current_point).get_house_edge() == house_edge
+
+def test_pass_line_resolves_with_certainty() -> None:
+    for current_point in STATES:
+        odds = get_bet_odds("Pass Line", current_point)
+        assert odds.win_probability + odds.lose_probability == 1
+
+    assert get_bet_odds("Pass Line", 4).win_probability == Fraction(1, 3)
+
+def test_profile_options_change_settlement() -> None:
+    profile = RuleProfile("test", field_twelve=3, dont_pass_bar=2, odds={point: 2 for point in POINTS}, buy_vig=5, lay_vig=5)
+    table = SettlementTable(profile)
+    odds = build_odds_table(table)
+
+    assert table.settle("Field", 0, [6, 6]) == (WIN, 3, 1)
+    assert table.settle("Don't Pass", 0, [1, 1]) == ("", 0, 1)
+    assert table.settle("Don't Pass", 0, [6, 6]) == (WIN, 1, 1)
+    assert table.settle("Buy 4", 4, [2, 2]) == (WIN, 39, 20)
+    assert table.settle("Lay 4", 4, [3, 4]) == (WIN, 19, 40)
+
+    assert odds[("Pass Odds", 4)].get_house_edge() == 0
+    assert odds[("Don't Pass Odds", 9)].get_house_edge() == 0
+    assert odds[("Buy 4", 4)].get_house_edge() == Fraction(1, 60)
+    assert odds[("Field", 0)].get_house_edge() == Fraction(1, 36)
+
+def test_profile_config_round_trip() -> None:
+    profile = RuleProfile.from_config("test", {"field_twelve": 3, "odds": [3, 4, 5], "buy_vig": 5})
+
+    assert profile.odds == {4: 3, 5: 4, 6: 5, 8: 5, 9: 4, 10: 3}
+    assert RuleProfile.from_config("copy", profile.to_config()).to_config() == profile.to_config()
+    assert RuleProfile.from_config("flat", {"odds": 2}).get_odds_limit(6) == 2
+    assert profile.get_bets() == BETS + list(ODDS_BETS) + ["Buy %d" % point for point in POINTS]
+
+def test_invalid_rules_raise() -> None:
+    with pytest.raises(RuntimeError):
+        RuleProfile("test", dont_pass_bar=3)
+
+    with pytest.raises(RuntimeError):
+        get_settlement_table("missing")
+
+    with pytest.raises(RuntimeError):
+        get_settlement_table().settle("Pass Odds", 4, [2, 2])
+
+    with pytest.raises(RuntimeError):
+        determine_bet_outcome("Missing", 0, 7, [3, 4])
+
+def test_next_point() -> None:
+    assert next_point(0, 7) == 0
+    assert next_point(0, 6) == 6
+    assert next_point(6, 8) == 6
+    assert next_point(6, 6) == 0
+    assert next_point(6, 7) == 0
+    assert next_point(0, 12) == 0
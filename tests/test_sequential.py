@@ -0,0 +1,58 @@
+import random
+import statistics
+
+import pytest
+
+from CrapsSequential import METRIC_BANKROLL, METRIC_EV_PER_ROLL, STOP_BUDGET, STOP_DECISION, STOP_PRECISION, RunningStats, compare, estimate, get_sample, get_z
+from CrapsSimulation import Strategy
+
+def test_running_stats_match_statistics() -> None:
+    rng = random.Random(0)
+    values = [rng.gauss(3, 2) for index in range(500)]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.get_variance() == pytest.approx(statistics.variance(values))
+    assert RunningStats().get_variance() == float("inf")
+
+def test_z_widens_with_each_look() -> None:
+    assert get_z(0.95, 1) == pytest.approx(statistics.NormalDist().inv_cdf(1 - 0.025 / 2))
+    assert get_z(0.95, 1) < get_z(0.95, 2) < get_z(0.95, 10)
+
+def test_estimate_stops_at_precision() -> None:
+    result = estimate(Strategy({"Pass Line": 5}), precision=0.02, rolls=200, seed=1)
+
+    assert result.stop_reason == STOP_PRECISION
+    assert result.samples >= 30
+    assert result.half_width <= 0.02
+    assert abs(result.mean + 5 * 7 / 495 * 165 / 557) <= result.half_width
+
+def test_estimate_stops_at_budget() -> None:
+    result = estimate(Strategy({"Pass Line": 5}), metric=METRIC_BANKROLL, precision=0.0001, rolls=100, max_rolls=5000)
+
+    assert result.stop_reason == STOP_BUDGET
+    assert result.rolls >= 5000
+    assert result.half_width > 0.0001
+
+def test_compare_identical_strategies_has_no_difference() -> None:
+    strategy = Strategy({"Pass Line": 5})
+    result = compare(strategy, strategy, rolls=100)
+
+    assert result.stop_reason == STOP_PRECISION
+    assert result.mean == 0
+    assert result.half_width == 0
+
+def test_compare_decides_between_different_strategies() -> None:
+    result = compare(Strategy({"Pass Line": 5}), Strategy({"Any 7": 5}), precision=0.0001, rolls=100)
+
+    assert result.stop_reason == STOP_DECISION
+    assert result.mean < -result.half_width
+
+def test_get_sample_rejects_invalid_metric() -> None:
+    with pytest.raises(RuntimeError):
+        get_sample(Strategy({"Pass Line": 5}), "invalid", [[3, 4]], 10000)
+
+    value, rolls = get_sample(Strategy({"Pass Line": 5}), METRIC_EV_PER_ROLL, [[3, 4]], 10000)
+    assert (value, rolls) == (5.0, 1)
@@ -0,0 +1,58 @@
+import random
+
+import numpy
+
+from CrapsSharedResults import SharedResults, run_chunk, run_shared
+from CrapsSimulation import Simulation, Strategy, roll_dice, run_sessions
+from CrapsState import TableState
+
+BETS = {"Pass Line": 5, "Place 6": 6, "Field": 1}
+
+def test_matches_run_sessions() -> None:
+    results = run_shared(BETS, 0, 10000, 40, 10, 5, workers=2, chunk_size=3)
+
+    try:
+        assert results.get_final_bankrolls().tolist() == run_sessions(BETS, 0, 10000, 40, 5, 10)
+        assert numpy.shares_memory(results.get_final_bankrolls(), results.trajectories)
+        assert results.get_mean_trajectory().tolist() == results.trajectories.mean(axis=0).tolist()
+    finally:
+        results.close()
+
+def test_outcome_counts_match_settlement() -> None:
+    results = run_shared(BETS, 4, 10000, 30, 4, 0, workers=1, chunk_size=2)
+    expected = {bet: {"win": 0, "lose": 0, "no decision": 0} for bet in sorted(BETS)}
+
+    for session in range(4):
+        rng = random.Random(session)
+        simulation = Simulation(Strategy(BETS), money=10000)
+        simulation.set_state(TableState(4, 10000, BETS))
+
+        for roll in range(30):
+            simulation.place_bets()
+            if not simulation.bets:
+                break
+
+            dice_values = roll_dice(rng)
+            for bet in simulation.bets:
+                outcome = simulation.settlement_table.settle(bet, simulation.current_point, dice_values)[0]
+                expected[bet][{"WIN": "win", "LOSE": "lose", "": "no decision"}[outcome]] += 1
+
+            simulation.roll(dice_values)
+
+    try:
+        assert results.get_outcome_counts() == expected
+    finally:
+        results.close()
+
+def test_partial_completion() -> None:
+    results = SharedResults(7, 20, sorted(BETS), 2)
+
+    try:
+        for chunk in (0, 1, 3):
+            run_chunk(results.get_spec(), chunk, BETS, 0, 10000, 0)
+
+        assert results.get_completed_slices() == [slice(0, 4), slice(6, 7)]
+        assert results.get_completed_count() == 5
+        assert results.get_final_bankrolls().tolist() == results.trajectories[[0, 1, 2, 3, 6], -1].tolist()
+    finally:
+        results.close()
@@ -0,0 +1,30 @@
+import random
+
+from CrapsSimulation import STOP_BUST, CancelToken, Simulation, Strategy, parse_bets, run_sessions, simulate
+
+def test_parse_bets() -> None:
+    assert parse_bets(["Pass Line=5", "Place 6=6"]) == {"Pass Line": 5, "Place 6": 6}
+
+def test_simulate_is_deterministic() -> None:
+    config = Strategy({"Pass Line": 5, "Field": 1}).to_config()
+
+    assert simulate(config, 3, 200).to_dict() == simulate(config, 3, 200).to_dict()
+
+def test_bust_stops_session() -> None:
+    result = Simulation(Strategy({"Any 7": 5}), money=500).run(random.Random(0), 10000)
+
+    assert result.stop_reason == STOP_BUST
+    assert result.money < 500
+
+def test_cancelled_sessions_return_none() -> None:
+    token = CancelToken()
+
+    try:
+        cancel = token.get_spec()
+        assert len(run_sessions({"Pass Line": 5}, 0, 10000, 50, 0, 3, cancel=cancel)) == 3
+
+        token.cancel()
+        assert run_sessions({"Pass Line": 5}, 0, 10000, 50, 0, 3, cancel=cancel) is None
+        assert len(run_sessions({"Pass Line": 5}, 0, 10000, 50, 0, 3, cancel=token.get_spec())) == 3
+    finally:
+        token.close()
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from CrapsSimulation import Simulation, Strategy, roll_dice
+from CrapsState import RunProgress, TableState, load_checkpoint, read_checkpoint, save_checkpoint
+
+def test_state_is_immutable() -> None:
+    state = TableState(4, 10000, {"Pass Line": 5})
+
+    with pytest.raises(RuntimeError):
+        state.point = 5
+
+    assert state.place_bet("Place 6", 6).get_bets() == {"Pass Line": 5, "Place 6": 6}
+    assert state.get_bets() == {"Pass Line": 5}
+
+def test_bytes_round_trip() -> None:
+    state = TableState(9, 12345, {"Pass Line": 5, "Place 6": 6, "Hard 8": 1}, "vegas")
+    data = b"xx" + state.to_bytes()
+
+    restored, offset = TableState.from_bytes(data, 2)
+    assert restored == state
+    assert offset == len(data)
+
+def test_roll_matches_simulation() -> None:
+    rng = random.Random(3)
+    simulation = Simulation(Strategy({"Pass Line": 5, "Place 8": 6, "Field": 1}), money=10 ** 7)
+    simulation.place_bets()
+    state = simulation.get_state()
+
+    for roll in range(500):
+        dice_values = roll_dice(rng)
+        simulation.roll(dice_values)
+        state = state.roll(dice_values)
+        assert state == simulation.get_state()
+
+        simulation.place_bets()
+        state = simulation.get_state()
+
+def test_checkpoint_restores_full_rng_state(tmp_path) -> None:
+    path = str(tmp_path / "craps.checkpoint")
+    state = TableState(6, 5000, {"Pass Line": 10})
+    rng = random.Random(11)
+    rng.gauss(0, 1)
+
+    save_checkpoint(path, state, rng, 42)
+    restored_state, restored_rng, rolls = load_checkpoint(path)
+
+    assert (restored_state, rolls) == (state, 42)
+    assert restored_rng.getstate() == rng.getstate()
+    assert [restored_rng.gauss(0, 1) for index in range(3)] == [rng.gauss(0, 1) for index in range(3)]
+
+def test_checkpoint_without_rng(tmp_path) -> None:
+    path = str(tmp_path / "craps.checkpoint")
+    save_checkpoint(path, TableState())
+
+    assert load_checkpoint(path) == (TableState(), None, 0)
+
+def test_checkpoint_with_run_progress(tmp_path) -> None:
+    path = str(tmp_path / "craps.checkpoint")
+    rng = random.Random(5)
+    save_checkpoint(path, TableState(0, 10000, {"Pass Line": 5}), rng, 300, RunProgress(b"d" * 32, 1234, {0, 20, 40}))
+
+    state, restored_rng, rolls, progress = read_checkpoint(path)
+    assert (state, rolls) == (TableState(0, 10000, {"Pass Line": 5}), 300)
+    assert restored_rng.getstate() == rng.getstate()
+    assert (progress.digest, progress.offset, progress.completed) == (b"d" * 32, 1234, {0, 20, 40})
+    assert load_checkpoint(path)[2] == 300
+
+    save_checkpoint(path, TableState())
+    assert read_checkpoint(path)[3] is None
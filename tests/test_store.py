@@ -0,0 +1,76 @@
+import numpy
+import pytest
+
+from CrapsSharedResults import run_shared, store_results
+from CrapsStore import ColumnStore, format_strategy, make_session_columns, parse_where
+from CrapsSweep import build_strategy_config, store_rows
+
+def make_store(path: str) -> ColumnStore:
+    store = ColumnStore(path)
+    store.append({"rules": ["standard", "vegas", "standard"], "point": [0, 4, 6], "money": [100, 200, 300]})
+    store.append({"rules": ["vegas", "reno"], "point": numpy.array([4, 0]), "money": numpy.array([400, 500])})
+    return store
+
+def test_query_filters(tmp_path) -> None:
+    store = make_store(str(tmp_path))
+
+    assert store.get_rows() == 5
+    assert store.query("money", "sum") == 1500
+    assert store.query("money", "mean", rules="vegas") == 300
+    assert store.query("money", "count", point=(1, None)) == 3
+    assert store.query("money", "max", rules=["standard", "reno"]) == 500
+    assert numpy.isnan(store.query("money", "mean", rules="missing"))
+
+def test_manifest_is_reloaded(tmp_path) -> None:
+    make_store(str(tmp_path))
+
+    assert ColumnStore(str(tmp_path)).query("money", "min", rules="reno") == 500
+
+def test_mismatched_columns_raise(tmp_path) -> None:
+    store = make_store(str(tmp_path))
+
+    with pytest.raises(RuntimeError):
+        store.append({"rules": ["standard"], "money": [1]})
+
+@pytest.mark.parametrize("aggregate", ["count", "sum", "mean", "min", "max"])
+def test_group_by_matches_query(tmp_path, aggregate: str) -> None:
+    store = make_store(str(tmp_path))
+
+    groups = store.group_by("rules", "money", aggregate)
+    assert groups == {rules: store.query("money", aggregate, rules=rules) for rules in ("standard", "vegas", "reno")}
+    assert store.group_by("point", "money", aggregate, rules="vegas") == {4: store.query("money", aggregate, rules="vegas")}
+
+def test_session_schema_fills_defaults() -> None:
+    columns = make_session_columns(2, {"source": "test", "money": [1, 2]})
+
+    assert columns["source"] == ["test", "test"]
+    assert columns["strategy"] == ["", ""]
+    assert columns["wagered"].tolist() == [-1, -1]
+
+    with pytest.raises(RuntimeError):
+        make_session_columns(1, {"point": [4]})
+
+def test_sweep_and_shared_rows_share_one_store(tmp_path) -> None:
+    store = ColumnStore(str(tmp_path))
+    rows = [{"base_bet": 5, "place": "6/8", "stop_loss": 0, "stop_win": 0, "rules": "standard", "seed": 1, "rolls": 10,
+             "start_money": 10000, "money": 10500, "min_money": 9000, "max_money": 11000, "wagered": 150, "stop_reason": "rolls"}]
+    store_rows(rows, store)
+
+    results = run_shared({"Pass Line": 5}, 4, 10000, 20, 6, 3, workers=1, chunk_size=2)
+    try:
+        store_results(results, store, {"Pass Line": 5}, 4, "standard", 3)
+    finally:
+        results.close()
+
+    assert store.get_rows() == 7
+    assert store.group_by("source", "money", "count") == {"sweep": 1, "shared": 6}
+    assert store.query("seed", "count", start_point=4) == 6
+    assert parse_where(["start_point=4"]) == {"start_point": 4}
+    assert store.query("seed", "min", source="shared") == 3
+    assert store.query("money", "max", strategy=format_strategy(build_strategy_config(5, [6, 8], 0, 0)["bets"])) == 10500
+
+def test_parse_where() -> None:
+    assert parse_where(["point=4", "rules=vegas"]) == {"point": 4, "rules": "vegas"}
+
+    with pytest.raises(RuntimeError):
+        parse_where(["point"])
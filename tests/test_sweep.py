@@ -0,0 +1,42 @@
+import os
+
+import CrapsSweep
+from CrapsSweep import ResultCache, expand_grid, sweep
+
+GRID = {"base_bet": [5, 10], "place": [[], [8, 6]]}
+
+def test_expand_grid() -> None:
+    cells = expand_grid(GRID, [0, 1, 2], 50)
+
+    assert len(cells) == 12
+    assert cells[-1]["place"] == [6, 8]
+    assert cells[-1]["strategy"]["bets"] == {"Pass Line": 10, "Place 6": 10, "Place 8": 10}
+    assert len({ResultCache.make_key(cell) for cell in cells}) == 12
+
+def test_sweep_reuses_cached_results(tmp_path, monkeypatch) -> None:
+    cache = ResultCache(str(tmp_path))
+    cells = expand_grid(GRID, [0, 1], 50)
+    rows = sweep(cells + cells[:2], cache)
+
+    assert len(rows) == 10
+    assert rows[8] == rows[0]
+
+    def fail(cell: dict) -> dict:
+        raise AssertionError("cell was not cached")
+
+    monkeypatch.setattr(CrapsSweep, "run_cell", fail)
+    assert sweep(cells, cache) == rows[:8]
+
+def test_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path), max_bytes=0)
+    for index, key in enumerate(("aa01", "bb02", "cc03")):
+        cache.put(key, {"index": index})
+        os.utime(cache.get_path(key), (index, index))
+
+    cache.max_bytes = sum(size for mtime, size, path in cache.get_entries()) - 1
+    assert cache.get("aa01") == {"index": 0}
+    assert cache.evict() == 1
+
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") == {"index": 0}
+    assert cache.get("cc03") == {"index": 2}
@@ -0,0 +1,49 @@
+import random
+from fractions import Fraction
+
+import pytest
+
+from CrapsRules import STATES, get_bet_odds, get_dice_outcomes, next_point
+from CrapsSimulation import Strategy
+from CrapsVariance import SAMPLING_INDEPENDENT, SAMPLING_STRATIFIED, apply_control_variate, get_first_rolls, get_mean, get_variance, run_common
+
+SESSIONS = 720
+ROLLS = 30
+MONEY = 10 ** 9
+
+def get_exact_pass_line_delta(amount: int, rolls: int) -> float:
+    distribution = {state: Fraction(0) for state in STATES}
+    distribution[0] = Fraction(1)
+    expected = Fraction(0)
+
+    for roll in range(rolls):
+        expected += sum(probability * get_bet_odds("Pass Line", state, "standard").roll_expected_value for state, probability in distribution.items())
+
+        pushed = {state: Fraction(0) for state in STATES}
+        for state, probability in distribution.items():
+            for dice_values in get_dice_outcomes():
+                pushed[next_point(state, sum(dice_values))] += probability / 36
+
+        distribution = pushed
+
+    return float(expected * amount)
+
+@pytest.mark.parametrize("sampling", [SAMPLING_INDEPENDENT, SAMPLING_STRATIFIED])
+@pytest.mark.parametrize("antithetic", [False, True])
+def test_pass_line_mean_matches_exact_edge(sampling: str, antithetic: bool) -> None:
+    exact = get_exact_pass_line_delta(5, ROLLS)
+    samples, controls = run_common([Strategy({"Pass Line": 5})], SESSIONS, ROLLS, 0, sampling, antithetic, MONEY)
+
+    for values in (samples[0], apply_control_variate(samples[0], controls[0])):
+        standard_error = (get_variance(values) / len(values)) ** 0.5
+        assert abs(get_mean(values) - exact) < 4 * standard_error
+
+    control_error = (get_variance(controls[0]) / SESSIONS) ** 0.5
+    assert abs(get_mean(controls[0])) < 4 * control_error
+
+def test_stratified_first_rolls_cover_every_outcome() -> None:
+    first_rolls = get_first_rolls(random.Random(0), 72, SAMPLING_STRATIFIED)
+    outcomes = sorted(tuple(dice_values) for dice_values in get_dice_outcomes())
+
+    assert sorted(tuple(dice_values) for dice_values in first_rolls[:36]) == outcomes
+    assert sorted(tuple(dice_values) for dice_values in first_rolls[36:]) == outcomes